@@ -4,11 +4,22 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from collections import defaultdict
 from typing import AsyncGenerator
 
 logger = logging.getLogger(__name__)
 
+# Fire-and-forget messages waiting for the background publisher
+_OUTBOX_SIZE = 1024
+
+
+def now_iso() -> str:
+    """Current UTC time as an ISO-8601 string with millisecond precision and a ``Z`` suffix."""
+    t = time.time()
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(t)) + f".{int(t * 1000) % 1000:03d}Z"
+
+
 class EventBus:
     """Singleton event bus for pub/sub communication."""
     
@@ -19,6 +30,9 @@ class EventBus:
             cls._instance = super().__new__(cls)
             cls._instance._channels = defaultdict(list)
             cls._instance._lock = asyncio.Lock()
+            cls._instance._outbox = None
+            cls._instance._pump_task = None
+            cls._instance.dropped = 0
         return cls._instance
         
     def __init__(self) -> None:
@@ -42,7 +56,37 @@ class EventBus:
                 # Use put_nowait to avoid blocking the publisher
                 queue.put_nowait(message)
             except asyncio.QueueFull:
-                logger.warning(f"Subscriber queue for channel '{channel}' is full. Dropping message.")
+                logger.warning("Subscriber queue for channel '%s' is full. Dropping message.", channel)
+
+    def publish_nowait(self, channel: str, message: dict | str) -> None:
+        """Queue a message for publishing without awaiting or creating a task per message.
+
+        A single background task drains the queue into :meth:`publish`. When the
+        queue is full the message is dropped (and counted in ``dropped``) so that
+        callers never block on event fan-out. Must be called from a running loop.
+        """
+        inst = self._instance
+        if inst._pump_task is None or inst._pump_task.done():
+            inst._outbox = asyncio.Queue(maxsize=_OUTBOX_SIZE)
+            inst._pump_task = asyncio.get_running_loop().create_task(self._pump(inst._outbox))
+        try:
+            inst._outbox.put_nowait((channel, message))
+        except asyncio.QueueFull:
+            inst.dropped += 1
+            logger.warning("Event outbox is full. Dropping message for channel '%s'.", channel)
+
+    def subscriber_count(self, channel: str) -> int:
+        """Number of active subscribers on a channel."""
+        return len(self._instance._channels.get(channel, ()))
+
+    async def _pump(self, outbox: asyncio.Queue) -> None:
+        """Forward queued messages to subscribers, one at a time."""
+        while True:
+            channel, message = await outbox.get()
+            try:
+                await self.publish(channel, message)
+            except Exception:
+                logger.exception("Failed to publish queued message on channel '%s'", channel)
 
     async def subscribe(self, channel: str) -> AsyncGenerator[dict | str, None]:
         """Subscribe to a channel and yield messages as they arrive."""
@@ -129,7 +129,7 @@ async def _publish_mock_grid_state(crisis_buses: set[int] | None = None) -> None
 
         if vm < 0.95:
             violations.append({
-                "violation_type": "voltage",
+                "violation_type": "voltage_low",
                 "zone": zone,
                 "severity": "critical" if vm < 0.90 else "warning",
                 "message": f"Low voltage at bus {bus_id}: {vm:.4f} p.u.",
@@ -19,6 +19,9 @@ class Settings(BaseSettings):
     # Per-zone coordinator agents: each zone gets a dedicated model instance
     # Safety guardian: validates actuator commands
     guardian_model: str = "llama-guard3:latest"
+    # Request JSON mode from the guardian model. Leave off for llama-guard
+    # models: they answer "safe" / "unsafe\nS#", which JSON mode would suppress.
+    guardian_json_mode: bool = False
 
     # Backwards compat alias
     llm_model: str = "llama3.1:latest"
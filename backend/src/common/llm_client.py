@@ -6,10 +6,13 @@ that can point to a different model on the same Ollama server.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+from collections.abc import Callable
 from typing import Any
 
+import httpx
 import openai
 
 from src.api.event_bus import event_bus
@@ -17,6 +20,12 @@ from src.common.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # noqa: F401  (httpx's optional HTTP/2 backend)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 
 class LLMClient:
     """Lightweight wrapper around an OpenAI-compatible LLM endpoint.
@@ -37,14 +46,27 @@ class LLMClient:
         self.model = model
         self.role = role
         self.system_prompt = system_prompt
+        # The system prompt is static per client: build its message once so every
+        # request starts with an identical prefix (friendly to server-side
+        # prompt/KV caching) and no per-call dict is allocated for it.
+        self._system_messages: tuple[dict, ...] = (
+            ({"role": "system", "content": system_prompt},) if system_prompt else ()
+        )
 
         raw_url = base_url or settings.llm_base_url
         if not raw_url.endswith("/v1") and "11434" in raw_url:
             raw_url = f"{raw_url.rstrip('/')}/v1"
 
+        # One pooled, keep-alive connection set per client for the process
+        # lifetime; concurrent calls (batched guardian validations, parallel
+        # tools) reuse warm connections instead of reconnecting.
         self.client = openai.AsyncOpenAI(
             api_key=api_key or settings.llm_api_key,
             base_url=raw_url,
+            http_client=openai.DefaultAsyncHttpxClient(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            ),
         )
         logger.info("[%s] LLM client ready → model=%s  url=%s", role, model, raw_url)
 
@@ -52,13 +74,16 @@ class LLMClient:
     # Simple completion (no tools)
     # ------------------------------------------------------------------
 
-    async def complete(self, user_message: str, *, temperature: float = 0.3) -> str:
-        """Single-turn completion with no tool calling."""
+    async def complete(
+        self, user_message: str, *, temperature: float = 0.3, json_mode: bool = False
+    ) -> str:
+        """Single-turn completion with no tool calling.
+
+        With ``json_mode`` the backend is asked for a JSON object, so callers
+        get syntactically valid JSON instead of fenced or prose-wrapped text.
+        """
         settings = get_settings()
-        messages = []
-        if self.system_prompt:
-            messages.append({"role": "system", "content": self.system_prompt})
-        messages.append({"role": "user", "content": user_message})
+        messages = [*self._system_messages, {"role": "user", "content": user_message}]
 
         extra_body = {"options": {"num_ctx": settings.llm_context_window}}
 
@@ -66,6 +91,7 @@ class LLMClient:
             model=self.model,
             messages=messages,
             temperature=temperature,
+            response_format={"type": "json_object"} if json_mode else openai.NOT_GIVEN,
             extra_body=extra_body,
         )
         return resp.choices[0].message.content or ""
@@ -82,6 +108,7 @@ class LLMClient:
         *,
         max_iterations: int = 10,
         tool_choice: str | dict | None = None,
+        is_read_only: Callable[[str], bool] | None = None,
     ) -> str:
         """Run an iterative tool-use loop and return the final text response.
 
@@ -90,12 +117,11 @@ class LLMClient:
             tools: List of OpenAI-format tool definitions.
             tool_executor: async callable(tool_name, arguments) -> dict
             max_iterations: Safety cap on tool-call rounds.
+            is_read_only: Predicate marking tools without side effects; only
+                those may run concurrently. When omitted every call is sequential.
         """
         settings = get_settings()
-        messages = []
-        if self.system_prompt:
-            messages.append({"role": "system", "content": self.system_prompt})
-        messages.append({"role": "user", "content": user_message})
+        messages = [*self._system_messages, {"role": "user", "content": user_message}]
 
         # Ollama-specific options
         extra_body = {"options": {"num_ctx": settings.llm_context_window}}
@@ -112,11 +138,13 @@ class LLMClient:
 
             if msg.tool_calls:
                 messages.append(msg)
+                calls = []
                 for tc in msg.tool_calls:
                     try:
                         args = json.loads(tc.function.arguments)
                     except json.JSONDecodeError:
                         args = {}
+                    calls.append((tc, args))
 
                     # Stream tool call to Brain Scanner UI
                     args_str = ", ".join(f"{k}={v}" for k, v in args.items())
@@ -125,8 +153,24 @@ class LLMClient:
                         "message": f"CALLING: {tc.function.name}({args_str})"
                     })
 
-                    result = await tool_executor(tc.function.name, args)
-
+                # Consecutive read-only calls run concurrently, so they cost the
+                # slowest call rather than the sum. Any other call may change the
+                # grid: it runs alone, in the order the model requested, so each
+                # one is validated against the effect of the calls before it.
+                results = []
+                batch = []
+                for tc, args in calls:
+                    if is_read_only is not None and is_read_only(tc.function.name):
+                        batch.append(tool_executor(tc.function.name, args))
+                        continue
+                    if batch:
+                        results.extend(await asyncio.gather(*batch))
+                        batch = []
+                    results.append(await tool_executor(tc.function.name, args))
+                if batch:
+                    results.extend(await asyncio.gather(*batch))
+
+                for (tc, _args), result in zip(calls, results):
                     # Stream tool result to Brain Scanner UI
                     if isinstance(result, dict):
                         summary_msg = result.get("message", result.get("error", "Success"))
@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import enum
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 # ---------------------------------------------------------------------------
@@ -91,7 +92,7 @@ class ActuatorResponse(BaseModel):
 class ViolationEvent(BaseModel):
     """A constraint violation detected by the monitoring system."""
     violation_id: str
-    violation_type: str  # "voltage", "thermal", "frequency", "stability"
+    violation_type: str  # "voltage_low", "voltage_high", "thermal", "frequency", "stability"
     zone: str
     severity: str  # "warning", "alarm", "critical"
     affected_components: list[str] = Field(default_factory=list)
@@ -102,6 +103,19 @@ class ViolationEvent(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
+class GuardianVerdict(BaseModel):
+    """Structured safety verdict returned by the guardian LLM."""
+    safe: bool
+    risk_level: Literal["LOW", "MEDIUM", "HIGH", "CRITICAL"] = "HIGH"
+    reasoning: str = ""
+    conditions: list[str] = Field(default_factory=list)
+
+    @field_validator("risk_level", mode="before")
+    @classmethod
+    def _upper_risk(cls, v: object) -> object:
+        return v.upper() if isinstance(v, str) else v
+
+
 class AgentDecision(BaseModel):
     """Record of a decision made by the strategic agent."""
     decision_id: str
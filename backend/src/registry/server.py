@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
 import logging
 
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.common.models import MCPServerRegistration, ServerStatus
@@ -167,9 +170,18 @@ async def get_server(server_id: str) -> MCPServerRegistration:
 
 
 @app.get("/tools")
-async def list_tools(domain: str | None = None) -> list[dict]:
-    """List all tools across all active MCP servers."""
-    return await store.list_all_tools(domain=domain)
+async def list_tools(request: Request, domain: str | None = None) -> Response:
+    """List all tools across all active MCP servers.
+
+    The response carries an ETag of the catalog so clients can revalidate a
+    cached copy with ``If-None-Match`` and receive ``304 Not Modified``.
+    """
+    tools = await store.list_all_tools(domain=domain)
+    body = json.dumps(jsonable_encoder(tools), sort_keys=True).encode()
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 @app.get("/tools/{tool_name}")
@@ -83,9 +83,8 @@ class DataGenerator:
                     continue
 
         # --- Transformer temperature sensors ---
-        for trafo_id in self.grid.net.trafo.index:
+        for trafo_id, temp in self.grid.get_transformer_temperatures().items():
             try:
-                temp = self.grid.get_transformer_temperature(trafo_id)
                 noise = random.gauss(0, 0.5)  # ±0.5°C
                 bus = int(self.grid.net.trafo.hv_bus.at[trafo_id])
                 zone = self._bus_to_zone(bus, zone_buses)
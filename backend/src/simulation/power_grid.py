@@ -3,21 +3,80 @@
 from __future__ import annotations
 
 import copy
+import json
 import logging
+import time
 from dataclasses import dataclass, field
+from datetime import datetime
+from collections.abc import Callable
+from typing import Any
 
 import numpy as np
 import pandapower as pp
 import pandapower.networks as pn
 import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+from src.simulation import violations_kernel
 
 logger = logging.getLogger(__name__)
 
+try:
+    import numba  # noqa: F401  (pandapower JIT-compiles Ybus/Jacobian assembly with it)
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+
+_ISO_FMT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+# Element tables/columns an action may touch. Captured before a dry run so the
+# net can be put back exactly without a JSON round-trip.
+_MUTABLE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "line": ("in_service",),
+    "trafo": ("in_service",),
+    "shunt": ("in_service", "q_mvar", "p_mw"),
+    "gen": ("in_service", "p_mw", "q_mvar", "vm_pu"),
+    "sgen": ("in_service", "p_mw", "q_mvar"),
+    "load": ("in_service", "p_mw", "q_mvar"),
+    "ext_grid": ("in_service", "vm_pu"),
+}
+
+# Linear screening limits: only small, pure-injection changes on a grid with
+# voltage headroom are accepted without an AC solve.
+_SCREEN_MAX_DELTA_MW = 10.0
+_SCREEN_MAX_LOADING_PCT = 95.0
+# Predicted voltages must stay this far inside the limits (linearization error)
+_SCREEN_VM_MARGIN = 0.01
+# DC pre-check: max predicted line loading accepted without an AC solve
+_DC_MAX_LOADING_PCT = 90.0
+
+# Simplified transformer thermal model: ambient + rise * (loading pu) ** 1.6
+_TRAFO_AMBIENT_C = 25.0
+_TRAFO_MAX_RISE_C = 65.0  # °C at 100% loading
+_TRAFO_THERMAL_EXP = 1.6
+
+
+def _safe_geo_xy(geo) -> tuple[float, float]:
+    """Parse a pandapower GeoJSON point string into (x, y); (0, 0) if missing/invalid."""
+    if pd.isna(geo):
+        return 0.0, 0.0
+    try:
+        coords = json.loads(geo).get('coordinates', [0, 0])
+        return float(coords[0]), float(coords[1])
+    except Exception:
+        return 0.0, 0.0
+
 
 @dataclass
 class GridSnapshot:
-    """Immutable snapshot of the grid state for rollback."""
-    net_json: str
+    """Immutable snapshot of the grid state for rollback.
+
+    Holds copies of the mutable element columns (see ``_MUTABLE_COLUMNS``)
+    keyed by table name, together with each table's index at save time.
+    """
+    column_arrays: dict[str, tuple[pd.Index, dict[str, np.ndarray]]]
     timestamp: str
 
 
@@ -37,6 +96,23 @@ class PowerGridSimulation:
         self._frequency_deviation: float = 0.0
         self._snapshots: list[GridSnapshot] = []
         self._storage_soc: dict[int, float] = {}  # storage index -> SoC (0-1)
+        # Warm-start state: reuse the last converged voltage vector as the NR
+        # initial guess until a topology change invalidates it.
+        self._has_prior_solution: bool = False
+        # Bumped on every power flow so derived results can be memoized per solution
+        self._pf_generation: int = 0
+        self._violations_cache: list[dict] = []
+        self._violations_cache_gen: int = -1
+        # When set, mutators skip their power flow (used for linear dry runs)
+        self._defer_power_flow: bool = False
+        # Fingerprint of the mutable inputs at the last AC solve (None = unknown)
+        self._solved_fingerprint: int | None = None
+        # (topology key, sparse LU of reduced DC susceptance matrix, branch data)
+        self._dc_cache: tuple | None = None
+        # Generation of the last converged AC solve (its Jacobian is in net._ppc)
+        self._ac_generation: int = -1
+        # (generation, (sparse LU of the AC Jacobian, pv, pq, bus lookup, n) or None)
+        self._jac_cache: tuple | None = None
 
         # 1. HACKATHON FIX: Scale down initial load so the grid starts "Green"
         self.net.load['p_mw'] *= 0.85
@@ -55,8 +131,32 @@ class PowerGridSimulation:
         # Set realistic line limits (default 1.0 kA)
         self.net.line["max_i_ka"] = 1.0
 
+        # Static zone layout, built once and shared by get_zone_buses() / get_state()
+        self._zone_buses_dict: dict[str, list[int]] = {
+            "zone1": list(range(0, 10)),
+            "zone2": list(range(10, 20)),
+            "zone3": list(range(20, 30)),
+        }
+        self._bus_to_zone_name = np.full(len(self.net.bus), "system", dtype=object)
+        for zone, buses in self._zone_buses_dict.items():
+            self._bus_to_zone_name[buses] = zone
+
+        # Bus geo coordinates are static, so parse them once for the UI layout
+        self._bus_x = np.zeros(len(self.net.bus))
+        self._bus_y = np.zeros(len(self.net.bus))
+        if 'geo' in self.net.bus.columns:
+            for pos, g in enumerate(self.net.bus.geo):
+                x, y = _safe_geo_xy(g)
+                self._bus_x[pos], self._bus_y[pos] = x * 150, y * 150
+
+        if not _NUMBA_AVAILABLE:
+            logger.warning(
+                "numba is not installed — pandapower will use the much slower "
+                "pure-numpy power flow path"
+            )
+
         # Run initial power flow
-        self.run_power_flow()
+        self._warmup()
         logger.info(
             "IEEE 30-bus grid initialized: %d buses, %d lines, %d gens, %d loads",
             len(self.net.bus), len(self.net.line), len(self.net.gen), len(self.net.load),
@@ -67,19 +167,107 @@ class PowerGridSimulation:
     # ------------------------------------------------------------------
 
     def run_power_flow(self) -> bool:
-        """Run AC power flow and return True if converged."""
-        try:
-            pp.runpp(self.net, enforce_q_lims=True, max_iteration=50)
-            converged = self.net.converged
+        """Run AC power flow and return True if converged.
+
+        Warm-starts Newton-Raphson from the previous solution when one is
+        available (small injection changes then converge in 1-2 iterations),
+        and falls back to a flat start if the warm start fails.
+        """
+        if self._defer_power_flow:
+            return bool(self.net.converged)
+
+        inits = ("results", "auto") if self._has_prior_solution else ("auto",)
+        converged = False
+        fingerprint = self._input_fingerprint()
+        # Even a failed solve may overwrite the result tables, so always invalidate
+        self._pf_generation += 1
+        for init in inits:
+            try:
+                pp.runpp(
+                    self.net,
+                    algorithm="nr",
+                    init=init,
+                    enforce_q_lims=True,
+                    max_iteration=50,
+                    numba=True,
+                )
+            except Exception as e:
+                if init == inits[-1]:
+                    logger.error("Power flow failed: %s", e)
+                else:
+                    logger.debug("Warm-started power flow failed, retrying flat start: %s", e)
+                continue
+            converged = bool(self.net.converged)
             if converged:
-                self._update_frequency()
-            else:
-                logger.warning("Power flow did not converge")
-            return converged
-        except Exception as e:
-            logger.error("Power flow failed: %s", e)
+                break
+
+        self._has_prior_solution = converged
+        # A failed solve is never current: the next call must retry it
+        self._solved_fingerprint = fingerprint if converged else None
+        if converged:
+            self._ac_generation = self._pf_generation
+            self._update_frequency()
+        else:
+            logger.warning("Power flow did not converge")
+        return converged
+
+    def run_dc_power_flow(self) -> bool:
+        """Run linear DC power flow (single sparse solve); return True if it succeeded.
+
+        Overwrites the result tables with DC results — callers that need the AC
+        solution afterwards must restore it or re-run ``run_power_flow``.
+        """
+        self._solved_fingerprint = None
+        # The result tables change, so results memoized on the AC solve are stale
+        self._pf_generation += 1
+        return self._solve_dc()
+
+    def _solve_dc(self) -> bool:
+        """Run ``rundcpp`` without touching solution bookkeeping (see ``_dc_screen``)."""
+        try:
+            pp.rundcpp(self.net)
+            return bool(self.net.converged)
+        except (pp.ppException, np.linalg.LinAlgError, RuntimeError) as e:
+            logger.debug("DC power flow failed: %s", e)
             return False
 
+    def solution_is_current(self) -> bool:
+        """True if no power-flow input has changed since the last converged AC solve.
+
+        Inputs (see ``_input_fingerprint``) are compared by content, so this also catches direct edits to
+        the pandapower tables (load profiles, scenarios) that bypass the mutators.
+        """
+        return self._solved_fingerprint is not None and self._solved_fingerprint == self._input_fingerprint()
+
+    def _input_fingerprint(self) -> int:
+        """Hash of the element columns listed in ``_MUTABLE_COLUMNS``.
+
+        These are the in-service flags and injection/voltage setpoints that
+        actions and scenarios change. Other inputs (impedances, ratings, bus
+        data) are not covered; edits to them need ``run_power_flow`` directly.
+        """
+        net = self.net
+        return hash(tuple(
+            tbl[col].to_numpy().tobytes()
+            for tbl, cols in ((getattr(net, t), c) for t, c in _MUTABLE_COLUMNS.items())
+            for col in cols
+            if col in tbl.columns
+        ))
+
+    def _warmup(self) -> None:
+        """Run the first power flow right after net construction.
+
+        numba compiles pandapower's kernels on first use, so paying that cost
+        here keeps it off the first monitoring cycle or agent action.
+        """
+        start = time.perf_counter()
+        self.run_power_flow()
+        logger.debug("Power flow warm-up took %.1f ms", (time.perf_counter() - start) * 1000)
+
+    def _invalidate_prior_solution(self) -> None:
+        """Force the next power flow to flat-start (e.g. after a topology change)."""
+        self._has_prior_solution = False
+
     def _update_frequency(self) -> None:
         """Simulate frequency deviation based on gen/load balance."""
         total_gen = self.net.res_gen.p_mw.sum() + self.net.res_ext_grid.p_mw.sum()
@@ -93,8 +281,12 @@ class PowerGridSimulation:
     # ------------------------------------------------------------------
 
     def get_bus_voltages(self) -> dict[int, float]:
-        """Get per-bus voltage magnitudes in p.u."""
-        return {k: (float(v) if pd.notna(v) else 0.0) for k, v in self.net.res_bus.vm_pu.items()}
+        """Get per-bus voltage magnitudes in p.u. (unsolved buses read as 0.0)."""
+        return dict(zip(self.net.res_bus.index.tolist(), self.get_bus_voltages_array().tolist()))
+
+    def get_bus_voltages_array(self) -> np.ndarray:
+        """Per-bus voltage magnitudes in p.u. as an array aligned with ``net.res_bus.index``."""
+        return np.nan_to_num(self.net.res_bus.vm_pu.to_numpy(dtype=float), nan=0.0)
 
     def get_bus_voltage(self, bus_id: int) -> float:
         """Get voltage at a specific bus in p.u."""
@@ -102,8 +294,12 @@ class PowerGridSimulation:
         return float(v) if pd.notna(v) else 0.0
 
     def get_line_loadings(self) -> dict[int, float]:
-        """Get line loading percentages."""
-        return {k: (float(v) if pd.notna(v) else 0.0) for k, v in self.net.res_line.loading_percent.items()}
+        """Get line loading percentages (unsolved lines read as 0.0)."""
+        return dict(zip(self.net.res_line.index.tolist(), self.get_line_loadings_array().tolist()))
+
+    def get_line_loadings_array(self) -> np.ndarray:
+        """Line loading percentages as an array aligned with ``net.res_line.index``."""
+        return np.nan_to_num(self.net.res_line.loading_percent.to_numpy(dtype=float), nan=0.0)
 
     def get_line_current(self, line_id: int) -> float:
         """Get line current in kA."""
@@ -112,16 +308,21 @@ class PowerGridSimulation:
 
     def get_transformer_loadings(self) -> dict[int, float]:
         """Get transformer loading percentages."""
-        return self.net.res_trafo.loading_percent.to_dict()
+        res = self.net.res_trafo
+        return dict(zip(res.index.tolist(), res.loading_percent.to_numpy(dtype=float).tolist()))
 
     def get_transformer_temperature(self, trafo_id: int) -> float:
         """Estimate transformer temperature from loading (simplified thermal model)."""
-        loading = float(self.net.res_trafo.loading_percent.at[trafo_id])
-        # Simple exponential thermal: ambient 25°C + loading-dependent rise
-        ambient = 25.0
-        max_rise = 65.0  # °C at 100% loading
-        temp = ambient + max_rise * (loading / 100.0) ** 1.6
-        return round(temp, 1)
+        loading_pu = float(self.net.res_trafo.loading_percent.at[trafo_id]) / 100.0
+        return round(_TRAFO_AMBIENT_C + _TRAFO_MAX_RISE_C * loading_pu ** _TRAFO_THERMAL_EXP, 1)
+
+    def get_transformer_temperatures(self) -> dict[int, float]:
+        """Estimated temperature of every transformer in one vectorized pass."""
+        res = self.net.res_trafo
+        loading_pu = res.loading_percent.to_numpy(dtype=float) / 100.0
+        rise = np.power(loading_pu, _TRAFO_THERMAL_EXP)
+        temps = np.round(_TRAFO_AMBIENT_C + _TRAFO_MAX_RISE_C * rise, 1)
+        return dict(zip(res.index.tolist(), temps.tolist()))
 
     def get_frequency(self) -> float:
         """Get simulated grid frequency in Hz."""
@@ -148,37 +349,52 @@ class PowerGridSimulation:
 
     def set_line_status(self, line_id: int, in_service: bool) -> dict:
         """Open/close a line (circuit breaker operation)."""
-        prev = bool(self.net.line.in_service.at[line_id])
-        self.net.line.in_service.at[line_id] = in_service
+        prev = bool(self.net.line.at[line_id, "in_service"])
+        if prev == in_service:
+            return {"line_id": line_id, "previous": prev, "current": in_service}
+        self.net.line.at[line_id, "in_service"] = in_service
+        self._invalidate_prior_solution()
         self.run_power_flow()
         return {"line_id": line_id, "previous": prev, "current": in_service}
 
     def set_generator_output(self, gen_id: int, p_mw: float, q_mvar: float | None = None) -> dict:
         """Adjust generator dispatch."""
-        prev_p = float(self.net.gen.p_mw.at[gen_id])
-        self.net.gen.p_mw.at[gen_id] = p_mw
+        prev_p = float(self.net.gen.at[gen_id, "p_mw"])
+        if prev_p == p_mw and (q_mvar is None or q_mvar == self.net.gen.at[gen_id, "q_mvar"]):
+            return {"gen_id": gen_id, "previous_p_mw": prev_p, "current_p_mw": p_mw}
+        self.net.gen.at[gen_id, "p_mw"] = p_mw
         if q_mvar is not None:
-            self.net.gen.q_mvar.at[gen_id] = q_mvar
+            self.net.gen.at[gen_id, "q_mvar"] = q_mvar
         self.run_power_flow()
         return {"gen_id": gen_id, "previous_p_mw": prev_p, "current_p_mw": p_mw}
 
     def scale_load(self, load_id: int, scale_factor: float) -> dict:
         """Scale a load by a factor (demand response)."""
-        prev_p = float(self.net.load.p_mw.at[load_id])
-        self.net.load.p_mw.at[load_id] = prev_p * scale_factor
-        self.net.load.q_mvar.at[load_id] *= scale_factor
+        prev_p = float(self.net.load.at[load_id, "p_mw"])
+        if scale_factor == 1.0:
+            return {
+                "load_id": load_id,
+                "previous_p_mw": prev_p,
+                "current_p_mw": prev_p,
+                "scale_factor": scale_factor,
+            }
+        prev_q = float(self.net.load.at[load_id, "q_mvar"])
+        self.net.load.at[load_id, "p_mw"] = prev_p * scale_factor
+        self.net.load.at[load_id, "q_mvar"] = prev_q * scale_factor
         self.run_power_flow()
         return {
             "load_id": load_id,
             "previous_p_mw": prev_p,
-            "current_p_mw": float(self.net.load.p_mw.at[load_id]),
+            "current_p_mw": float(self.net.load.at[load_id, "p_mw"]),
             "scale_factor": scale_factor,
         }
 
     def set_shunt_status(self, shunt_id: int, in_service: bool) -> dict:
         """Activate/deactivate a shunt capacitor bank."""
-        prev = bool(self.net.shunt.in_service.at[shunt_id])
-        self.net.shunt.in_service.at[shunt_id] = in_service
+        prev = bool(self.net.shunt.at[shunt_id, "in_service"])
+        if prev == in_service:
+            return {"shunt_id": shunt_id, "previous": prev, "current": in_service}
+        self.net.shunt.at[shunt_id, "in_service"] = in_service
         self.run_power_flow()
         return {"shunt_id": shunt_id, "previous": prev, "current": in_service}
 
@@ -191,14 +407,15 @@ class PowerGridSimulation:
         loads_at_bus = self.net.load[self.net.load.bus == bus_id]
         if len(loads_at_bus) > 0:
             load_id = loads_at_bus.index[0]
-            self.net.load.loc[load_id, 'p_mw'] += delta_mw
+            self.net.load.at[load_id, "p_mw"] += delta_mw
         else:
             pp.create_load(self.net, bus=bus_id, p_mw=delta_mw, q_mvar=delta_mw * 0.3)
         self.run_power_flow()
 
     def trip_line(self, line_id: int) -> None:
         """Simulate a line trip (fault)."""
-        self.net.line.in_service.at[line_id] = False
+        self.net.line.at[line_id, "in_service"] = False
+        self._invalidate_prior_solution()
         self.run_power_flow()
 
     # ------------------------------------------------------------------
@@ -207,9 +424,8 @@ class PowerGridSimulation:
 
     def save_snapshot(self) -> int:
         """Save current grid state; return snapshot index."""
-        from datetime import datetime
         snapshot = GridSnapshot(
-            net_json=pp.to_json(self.net),
+            column_arrays=self._capture_columns(),
             timestamp=datetime.utcnow().isoformat(),
         )
         self._snapshots.append(snapshot)
@@ -224,46 +440,53 @@ class PowerGridSimulation:
         os.replace(temp_path, path)
 
     def restore_snapshot(self, index: int) -> bool:
-        """Restore grid state from a snapshot."""
+        """Restore grid state from a snapshot.
+
+        Writes the saved columns back into the existing net (object identity is
+        kept), so no JSON parse or index rebuild is needed.
+        """
         if 0 <= index < len(self._snapshots):
-            self.net = pp.from_json_string(self._snapshots[index].net_json)
-            self.run_power_flow()
+            self._restore_state(self._snapshots[index].column_arrays)
             logger.info("Restored grid snapshot %d", index)
             return True
         return False
 
-    def validate_action(self, action_fn, *args, **kwargs) -> dict:
+    def _restore_state(self, column_arrays: dict) -> None:
+        """Write captured columns back and re-solve (topology may have moved)."""
+        self._restore_columns(column_arrays)
+        self._invalidate_prior_solution()
+        self.run_power_flow()
+
+    def validate_action(self, action_fn, *args, mode: str = "dc_first", **kwargs) -> dict:
         """Run an action in sandbox mode: save → execute → check delta → restore.
 
         Only blocks actions that introduce NEW violations beyond pre-existing ones.
         This is critical for corrective actions (e.g. ramping a generator when the
         grid is already in a degraded state with violations).
+
+        With ``mode="dc_first"`` (default), small pure-injection actions on a
+        healthy grid are first screened with linear voltage and line-flow
+        sensitivities, and pure active-power redispatch is then checked with a
+        DC power flow; only if neither proves the action safe does it escalate
+        to AC. ``mode="ac"`` always runs the exact AC check. Switching always
+        goes to AC.
         """
-        snapshot_idx = self.save_snapshot()
+        if mode == "dc_first":
+            screened = self._linear_screen(action_fn, *args, **kwargs)
+            if screened is None:
+                screened = self._dc_screen(action_fn, *args, **kwargs)
+            if screened is not None:
+                return screened
+
+        saved = self._capture_columns()
         try:
             # Capture pre-action violation fingerprints
             pre_violations = self._check_violations()
-            pre_components = {v["component"] for v in pre_violations}
 
             action_fn(*args, **kwargs)
 
             post_violations = self._check_violations()
-
-            # Only flag violations on components that were NOT already in violation
-            new_violations = [v for v in post_violations if v["component"] not in pre_components]
-
-            # Also block if a metric got significantly WORSE on an existing violation
-            worsened = []
-            pre_by_comp = {v["component"]: v for v in pre_violations}
-            for v in post_violations:
-                if v["component"] in pre_by_comp:
-                    old_val = pre_by_comp[v["component"]]["value"]
-                    new_val = v["value"]
-                    # Worsened if deviation from limit grew by >5%
-                    if abs(new_val - 1.0) > abs(old_val - 1.0) + 0.05:
-                        worsened.append(v)
-
-            blocking = new_violations + worsened
+            blocking = self._blocking_violations(pre_violations, post_violations)
             safe = len(blocking) == 0
             return {
                 "safe": safe,
@@ -272,33 +495,375 @@ class PowerGridSimulation:
                 "note": "Only new/worsened violations are blocking; pre-existing violations are ignored.",
             }
         finally:
-            self.restore_snapshot(snapshot_idx)
+            self._restore_state(saved)
+
+    def evaluate_actions(self, actions: list[Callable[[], Any]]) -> list[dict]:
+        """Evaluate several candidate actions against the current state as one batch.
+
+        Each candidate is applied to the same base state and solved. Between
+        candidates only the element columns are rolled back — the solution is
+        left in place so the next candidate warm-starts from a neighbouring
+        operating point — and the base results are re-solved once at the end.
+        Compared with calling ``validate_action`` per candidate this saves one
+        restore solve per candidate.
+
+        Returns one result per action, aligned with ``actions``.
+        """
+        if not actions:
+            return []
+
+        pre_violations = self._check_violations()
+        base = self._capture_columns()
+        results: list[dict] = []
+        try:
+            for action_fn in actions:
+                gen_before = self._pf_generation
+                try:
+                    action_fn()
+                    if self._pf_generation == gen_before:
+                        # No-op mutations skip the solve; don't read a neighbour's results
+                        self.run_power_flow()
+                    converged = bool(self.net.converged)
+                    blocking = self._blocking_violations(pre_violations, self._check_violations())
+                    results.append({
+                        "safe": converged and not blocking,
+                        "converged": converged,
+                        "violations": blocking,
+                    })
+                except (KeyError, IndexError, ValueError, TypeError) as e:
+                    logger.warning("Candidate action failed during batch evaluation: %s", e)
+                    results.append({"safe": False, "converged": False, "violations": [], "error": str(e)})
+                finally:
+                    self._restore_columns(base)
+        finally:
+            self._restore_state(base)
+        return results
+
+    @staticmethod
+    def _blocking_violations(pre_violations: list[dict], post_violations: list[dict]) -> list[dict]:
+        """Violations introduced or significantly worsened by an action."""
+        pre_by_comp = {v["component"]: v for v in pre_violations}
+
+        # Only flag violations on components that were NOT already in violation
+        new_violations = [v for v in post_violations if v["component"] not in pre_by_comp]
+
+        # Also block if a metric got significantly WORSE on an existing violation
+        worsened = []
+        for v in post_violations:
+            if v["component"] in pre_by_comp:
+                old_val = pre_by_comp[v["component"]]["value"]
+                new_val = v["value"]
+                # Worsened if deviation from limit grew by >5%
+                if abs(new_val - 1.0) > abs(old_val - 1.0) + 0.05:
+                    worsened.append(v)
+
+        return new_violations + worsened
+
+    def _linear_screen(self, action_fn, *args, **kwargs) -> dict | None:
+        """Dry-run an action and predict its voltage and line-flow impact linearly.
+
+        The action is applied with power flows deferred and the net is put
+        back. The resulting bus injection change is pushed through the AC
+        Jacobian (voltages) and the cached DC model (line flows). Returns a
+        ``validate_action`` result when the action is provably safe, or None
+        when a full AC validation is required.
+        """
+        if not self._screenable():
+            return None
+
+        before = self._capture_columns()
+        self._defer_power_flow = True
+        try:
+            action_fn(*args, **kwargs)
+            delta_s = self._injection_delta(before)
+        finally:
+            self._defer_power_flow = False
+            self._restore_columns(before)
+            # The solved state was never touched, so it is still a valid warm start
+            self._has_prior_solution = True
+
+        if delta_s is None or np.abs(delta_s).max(initial=0.0) > _SCREEN_MAX_DELTA_MW:
+            return None
+        if not self._predicted_voltages_ok(delta_s):
+            return None
+        delta_mw = delta_s.real
+
+        dc = self._dc_sensitivity()
+        if dc is None:
+            return None
+        lu, keep, line_ids, f, t, b, i_base_ka = dc
+
+        theta = np.zeros(len(delta_mw))
+        theta[keep] = lu.solve(delta_mw[keep] / float(self.net.sn_mva))
+        dflow_mw = (theta[f] - theta[t]) * b * float(self.net.sn_mva)
+        vn_kv = self.net.bus.vn_kv.to_numpy(dtype=float)[f]
+        dloading = np.abs(dflow_mw) / (np.sqrt(3) * vn_kv) / i_base_ka * 100.0
+
+        loading = np.nan_to_num(
+            self.net.res_line.loading_percent.reindex(line_ids).to_numpy(dtype=float), nan=0.0,
+        )
+        if np.any(loading + dloading >= _SCREEN_MAX_LOADING_PCT):
+            return None
+
+        return {
+            "safe": True,
+            "violations": [],
+            "pre_existing_violations": 0,
+            "note": "Screened by linear DC sensitivity; no AC validation needed.",
+        }
+
+    def _dc_screen(self, action_fn, *args, **kwargs) -> dict | None:
+        """Dry-run an action and check thermal limits with a DC power flow.
+
+        Handles larger active-power redispatch the linear screen declines.
+        Only pure P setpoint changes are eligible, and they must also pass the
+        first-order AC voltage check; anything touching in-service flags,
+        topology, reactive setpoints, shunts or voltage setpoints is left to
+        AC validation, since DC says nothing about voltages or convergence.
+        The AC results (and the internal AC case) in the net are preserved.
+        """
+        if not self._screenable():
+            return None
+
+        before = self._capture_columns()
+        saved_results = {
+            k: self.net[k].copy() for k in self.net
+            if k.startswith("res_") and isinstance(self.net[k], pd.DataFrame)
+        }
+        saved_converged = self.net.converged
+        saved_ppc = self.net["_ppc"]
+        saved_lookups = self.net["_pd2ppc_lookups"]
+        safe = False
+        self._defer_power_flow = True
+        try:
+            action_fn(*args, **kwargs)
+            delta_s = self._injection_delta(before)
+            if (
+                delta_s is not None
+                and not np.any(delta_s.imag)
+                and self._predicted_voltages_ok(delta_s)
+                and self._solve_dc()
+            ):
+                loading = self.net.res_line.loading_percent.to_numpy(dtype=float)
+                safe = bool(np.all(np.isfinite(loading)) and np.all(loading < _DC_MAX_LOADING_PCT))
+        finally:
+            self._defer_power_flow = False
+            self._restore_columns(before)
+            for k, df in saved_results.items():
+                self.net[k] = df
+            self.net.converged = saved_converged
+            self.net["_ppc"] = saved_ppc
+            self.net["_pd2ppc_lookups"] = saved_lookups
+            self._has_prior_solution = True
+
+        if not safe:
+            return None
+        return {
+            "safe": True,
+            "violations": [],
+            "pre_existing_violations": 0,
+            "note": f"Screened by DC power flow (all line loadings < {_DC_MAX_LOADING_PCT:.0f}%); no AC validation needed.",
+        }
+
+    def _screenable(self) -> bool:
+        """Whether the current state allows approximate (non-AC) validation.
+
+        Requires a converged AC solution with no violations; per-action voltage
+        headroom is checked by ``_predicted_voltages_ok``.
+        """
+        return self._has_prior_solution and not self._check_violations()
+
+    def _capture_columns(self) -> dict[str, tuple[pd.Index, dict[str, np.ndarray]]]:
+        """Copy the index and mutable columns of every actionable element table."""
+        captured = {}
+        for tbl_name, cols in _MUTABLE_COLUMNS.items():
+            tbl = getattr(self.net, tbl_name)
+            captured[tbl_name] = (
+                tbl.index.copy(),
+                {c: tbl[c].to_numpy(copy=True) for c in cols if c in tbl.columns},
+            )
+        return captured
+
+    def _restore_columns(self, captured: dict[str, tuple[pd.Index, dict[str, np.ndarray]]]) -> None:
+        """Write captured columns back, dropping any rows created since the capture.
+
+        Elements are only ever added (never removed) at runtime, so dropping
+        the extra rows realigns each table with its captured index.
+        """
+        for tbl_name, (index, cols) in captured.items():
+            tbl = getattr(self.net, tbl_name)
+            if not tbl.index.equals(index):
+                tbl.drop(index=tbl.index.difference(index), inplace=True)
+            for col, arr in cols.items():
+                tbl[col] = arr
+
+    def _injection_delta(self, before: dict) -> np.ndarray | None:
+        """Per-bus complex injection change (MW + j Mvar) since ``before``.
+
+        Returns None if anything other than load/gen/sgen P/Q setpoints changed
+        (topology, shunts, voltage setpoints, in-service flags, new elements),
+        since those are outside what the linear models can vouch for.
+        """
+        bus_pos = pd.Series(np.arange(len(self.net.bus)), index=self.net.bus.index)
+        delta = np.zeros(len(self.net.bus), dtype=complex)
+        for tbl_name, (index, cols) in before.items():
+            tbl = getattr(self.net, tbl_name)
+            if not tbl.index.equals(index):
+                return None
+            for col, old in cols.items():
+                new = tbl[col].to_numpy()
+                if np.array_equal(old, new):
+                    continue
+                if tbl_name not in ("load", "gen", "sgen") or col not in ("p_mw", "q_mvar"):
+                    return None
+                diff = np.nan_to_num(new.astype(float) - old.astype(float))
+                sign = -1.0 if tbl_name == "load" else 1.0
+                if col == "q_mvar":
+                    diff = diff * 1j
+                np.add.at(delta, bus_pos[tbl.bus].to_numpy(), sign * diff)
+        return delta
+
+    def _predicted_voltages_ok(self, delta_s: np.ndarray) -> bool:
+        """First-order check that an injection change keeps every bus within limits.
+
+        Pushes ``delta_s`` (MW + j Mvar per bus) through the Jacobian of the
+        current AC solution (Q-limited generators already converted to PQ) and
+        requires every predicted magnitude to stay ``_SCREEN_VM_MARGIN`` inside
+        the violation limits.
+        """
+        jac = self._voltage_sensitivity()
+        if jac is None:
+            return False
+        lu, pv, pq, lookup, n_ppc = jac
+        s_pu = np.zeros(n_ppc, dtype=complex)
+        np.add.at(s_pu, lookup, delta_s / float(self.net.sn_mva))
+        dx = lu.solve(np.r_[s_pu[pv].real, s_pu[pq].real, s_pu[pq].imag])
+        dvm = np.zeros(len(s_pu))
+        dvm[pq] = dx[len(pv) + len(pq):]
+        vm = self.net.res_bus.vm_pu.to_numpy(dtype=float) + dvm[lookup]
+        return bool(np.all(
+            (vm >= violations_kernel.V_LOW + _SCREEN_VM_MARGIN)
+            & (vm <= violations_kernel.V_HIGH - _SCREEN_VM_MARGIN)
+        ))
+
+    def _voltage_sensitivity(self) -> tuple | None:
+        """Sparse-LU factor of the last converged AC Jacobian, cached per solution.
+
+        Reads pandapower's internal power-flow case, so it is only valid while
+        the net still holds that AC solve; anything unexpected (a DC solve
+        since, extra FACTS/distributed-slack rows) falls back to None.
+        """
+        gen = self._pf_generation
+        if self._jac_cache is not None and self._jac_cache[0] == gen:
+            return self._jac_cache[1]
+
+        result = None
+        if self._ac_generation == gen:
+            try:
+                internal = self.net._ppc["internal"]
+                pv, pq = internal["pv"], internal["pq"]
+                J = internal["J"]
+                if J.shape == (len(pv) + 2 * len(pq),) * 2:
+                    lookup = self.net._pd2ppc_lookups["bus"][self.net.bus.index.to_numpy()]
+                    result = (splu(J.tocsc()), pv, pq, lookup, len(internal["bus"]))
+            except (KeyError, AttributeError, TypeError, RuntimeError) as e:
+                # No stored Jacobian, or a singular one
+                logger.debug("AC voltage sensitivity unavailable: %s", e)
+
+        self._jac_cache = (gen, result)
+        return result
+
+    def _dc_sensitivity(self) -> tuple | None:
+        """Sparse-LU factor of the reduced DC susceptance matrix, cached per topology."""
+        net = self.net
+        key = (
+            id(net),
+            net.line.in_service.to_numpy().tobytes(),
+            net.trafo.in_service.to_numpy().tobytes(),
+            net.ext_grid.bus.to_numpy().tobytes(),
+        )
+        if self._dc_cache is not None and self._dc_cache[0] == key:
+            return self._dc_cache[1]
+
+        result = None
+        try:
+            base_mva = float(net.sn_mva)
+            n = len(net.bus)
+            bus_pos = pd.Series(np.arange(n), index=net.bus.index)
+            vn_kv = net.bus.vn_kv.to_numpy(dtype=float)
+
+            line = net.line[net.line.in_service]
+            f = bus_pos[line.from_bus].to_numpy()
+            t = bus_pos[line.to_bus].to_numpy()
+            z_base = vn_kv[f] ** 2 / base_mva
+            x_line = (line.x_ohm_per_km * line.length_km / line.parallel).to_numpy(dtype=float) / z_base
+            b_line = 1.0 / x_line
+
+            trafo = net.trafo[net.trafo.in_service]
+            tf = bus_pos[trafo.hv_bus].to_numpy()
+            tt = bus_pos[trafo.lv_bus].to_numpy()
+            x_trafo = (trafo.vk_percent / 100.0 * base_mva / trafo.sn_mva / trafo.parallel).to_numpy(dtype=float)
+
+            fb = np.concatenate([f, tf])
+            tb = np.concatenate([t, tt])
+            bb = np.concatenate([b_line, 1.0 / x_trafo])
+            B = sparse.coo_matrix(
+                (np.concatenate([bb, bb, -bb, -bb]),
+                 (np.concatenate([fb, tb, fb, tb]), np.concatenate([fb, tb, tb, fb]))),
+                shape=(n, n),
+            ).tocsr()
+
+            slack = bus_pos[net.ext_grid.bus[net.ext_grid.in_service]].to_numpy()
+            keep = np.setdiff1d(np.arange(n), slack)
+            lu = splu(B[keep][:, keep].tocsc())
+
+            i_base_ka = (line.max_i_ka * line.df * line.parallel).to_numpy(dtype=float)
+            result = (lu, keep, line.index, f, t, b_line, i_base_ka)
+        except (KeyError, IndexError, ValueError, RuntimeError) as e:
+            # Islanded/singular topologies simply fall back to AC validation
+            logger.debug("DC sensitivity model unavailable: %s", e)
+
+        self._dc_cache = (key, result)
+        return result
 
     def _check_violations(self) -> list[dict]:
-        """Check for constraint violations in current state."""
+        """Check for constraint violations in current state.
+
+        Memoized per power-flow solution; the returned list is shared between
+        callers until the next ``run_power_flow`` and must not be mutated.
+        """
+        if self._violations_cache_gen == self._pf_generation:
+            return self._violations_cache
+
         violations = []
 
+        res_bus = self.net.res_bus
+        res_line = self.net.res_line
+        vm = np.nan_to_num(res_bus.vm_pu.to_numpy(dtype=float), nan=0.0)
+        loading = np.nan_to_num(res_line.loading_percent.to_numpy(dtype=float), nan=0.0)
+        bus_pos, bus_sev, line_pos, line_sev = violations_kernel.scan(vm, loading)
+
         # Voltage violations (0.95 - 1.05 p.u.)
-        for bus_id, vm in self.get_bus_voltages().items():
-            if vm < 0.95 or vm > 1.05:
-                violations.append({
-                    "type": "voltage",
-                    "component": f"bus_{bus_id}",
-                    "value": vm,
-                    "limit": "0.95-1.05 p.u.",
-                    "severity": "critical" if (vm < 0.90 or vm > 1.10) else "warning",
-                })
+        bus_ids = res_bus.index
+        for p, sev in zip(bus_pos.tolist(), bus_sev.tolist()):
+            violations.append({
+                "type": "voltage",
+                "component": f"bus_{bus_ids[p]}",
+                "value": float(vm[p]),
+                "limit": "0.95-1.05 p.u.",
+                "severity": violations_kernel.SEVERITY_NAMES[sev],
+            })
 
         # Thermal violations (line loading > 100%)
-        for line_id, loading in self.get_line_loadings().items():
-            if loading > 100.0:
-                violations.append({
-                    "type": "thermal",
-                    "component": f"line_{line_id}",
-                    "value": loading,
-                    "limit": "100%",
-                    "severity": "critical" if loading > 120 else "warning",
-                })
+        line_ids = res_line.index
+        for p, sev in zip(line_pos.tolist(), line_sev.tolist()):
+            violations.append({
+                "type": "thermal",
+                "component": f"line_{line_ids[p]}",
+                "value": float(loading[p]),
+                "limit": "100%",
+                "severity": violations_kernel.SEVERITY_NAMES[sev],
+            })
 
         # Frequency violations
         freq = self.get_frequency()
@@ -311,6 +876,8 @@ class PowerGridSimulation:
                 "severity": "critical" if abs(freq - self._base_frequency) > 1.0 else "warning",
             })
 
+        self._violations_cache = violations
+        self._violations_cache_gen = self._pf_generation
         return violations
 
     # ------------------------------------------------------------------
@@ -324,12 +891,10 @@ class PowerGridSimulation:
         - Zone1: Buses 0-9   (generation-heavy area)
         - Zone2: Buses 10-19 (mixed area)
         - Zone3: Buses 20-29 (load-heavy area)
+
+        The returned dict is cached and shared between callers — do not mutate it.
         """
-        return {
-            "zone1": list(range(0, 10)),
-            "zone2": list(range(10, 20)),
-            "zone3": list(range(20, 30)),
-        }
+        return self._zone_buses_dict
 
     def get_zone_lines(self) -> dict[str, list[int]]:
         """Return lines belonging to each zone (both endpoints in zone)."""
@@ -347,41 +912,29 @@ class PowerGridSimulation:
 
     def get_state(self, zone_health: dict | None = None) -> dict:
         """Generate a JSON-serializable dict of the current grid state for the UI."""
-        from datetime import datetime
-        import json as _json
-
-        nodes_data = []
-        for b, v in self.get_bus_voltages().items():
-            x, y = 0, 0
-            if 'geo' in self.net.bus.columns and not pd.isna(self.net.bus.geo.at[b]):
-                try:
-                    geo_dict = _json.loads(self.net.bus.geo.at[b])
-                    coords = geo_dict.get('coordinates', [0, 0])
-                    x = float(coords[0]) * 150
-                    y = float(coords[1]) * 150
-                except Exception:
-                    pass
-            
-            # Find which zone this bus belongs to
-            bus_zone = "system"
-            for z_name, z_buses in self.get_zone_buses().items():
-                if b in z_buses:
-                    bus_zone = z_name
-                    break
-
-            nodes_data.append({"id": b, "vm_pu": v, "x": x, "y": y, "zone": bus_zone})
-
-        edges_data = []
-        for l, ld in self.get_line_loadings().items():
-            try:
-                from_b = int(self.net.line.at[l, "from_bus"])
-                to_b = int(self.net.line.at[l, "to_bus"])
-                edges_data.append({"id": l, "loading_percent": ld, "from_bus": from_b, "to_bus": to_b})
-            except Exception:
-                pass
+        res_bus = self.net.res_bus
+        bus_ids = res_bus.index.to_numpy()
+        nodes_df = pd.DataFrame({
+            "id": bus_ids,
+            "vm_pu": np.nan_to_num(res_bus.vm_pu.to_numpy(dtype=float), nan=0.0),
+            "x": self._bus_x[bus_ids],
+            "y": self._bus_y[bus_ids],
+            "zone": self._bus_to_zone_name[bus_ids],
+        })
+        nodes_data = nodes_df.to_dict(orient="records")
+
+        res_line = self.net.res_line
+        line_ids = res_line.index
+        edges_df = pd.DataFrame({
+            "id": line_ids.to_numpy(),
+            "loading_percent": np.nan_to_num(res_line.loading_percent.to_numpy(dtype=float), nan=0.0),
+            "from_bus": self.net.line.from_bus.reindex(line_ids).to_numpy(dtype=int),
+            "to_bus": self.net.line.to_bus.reindex(line_ids).to_numpy(dtype=int),
+        })
+        edges_data = edges_df.to_dict(orient="records")
 
         return {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.utcnow().strftime(_ISO_FMT),
             "total_generation_mw": self.get_total_generation(),
             "total_load_mw": self.get_total_load(),
             "total_losses_mw": self.get_total_losses(),
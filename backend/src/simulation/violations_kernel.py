@@ -0,0 +1,78 @@
+"""Compiled scan for voltage/thermal limit violations.
+
+The scan only returns the positions and severity codes of violating elements;
+the caller wraps those (usually few) hits into violation records. Compiled with
+numba when available, otherwise a NumPy implementation with the same contract
+is used.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is a declared dependency
+    njit = None
+
+V_LOW = 0.95
+V_HIGH = 1.05
+V_CRIT_LOW = 0.90
+V_CRIT_HIGH = 1.10
+LOADING_MAX = 100.0
+LOADING_CRIT = 120.0
+
+SEVERITY_WARNING = 1
+SEVERITY_CRITICAL = 2
+SEVERITY_NAMES = {SEVERITY_WARNING: "warning", SEVERITY_CRITICAL: "critical"}
+
+
+def _scan_loop(vm: np.ndarray, loading: np.ndarray):
+    """Return (bus_pos, bus_severity, line_pos, line_severity) for violating elements.
+
+    ``vm`` and ``loading`` must be contiguous float64 arrays with NaN already mapped.
+    """
+    out_bus = np.empty(len(vm), np.int64)
+    out_bus_sev = np.empty(len(vm), np.int8)
+    k = 0
+    for i in range(len(vm)):
+        v = vm[i]
+        if v < V_LOW or v > V_HIGH:
+            out_bus[k] = i
+            out_bus_sev[k] = SEVERITY_CRITICAL if (v < V_CRIT_LOW or v > V_CRIT_HIGH) else SEVERITY_WARNING
+            k += 1
+
+    out_line = np.empty(len(loading), np.int64)
+    out_line_sev = np.empty(len(loading), np.int8)
+    m = 0
+    for j in range(len(loading)):
+        ld = loading[j]
+        if ld > LOADING_MAX:
+            out_line[m] = j
+            out_line_sev[m] = SEVERITY_CRITICAL if ld > LOADING_CRIT else SEVERITY_WARNING
+            m += 1
+
+    return out_bus[:k], out_bus_sev[:k], out_line[:m], out_line_sev[:m]
+
+
+def _scan_numpy(vm: np.ndarray, loading: np.ndarray):
+    """Vectorized fallback for :func:`_scan_loop` with the same return contract."""
+    bus = np.flatnonzero((vm < V_LOW) | (vm > V_HIGH))
+    bus_crit = (vm[bus] < V_CRIT_LOW) | (vm[bus] > V_CRIT_HIGH)
+    line = np.flatnonzero(loading > LOADING_MAX)
+    line_crit = loading[line] > LOADING_CRIT
+    return (
+        bus,
+        np.where(bus_crit, SEVERITY_CRITICAL, SEVERITY_WARNING).astype(np.int8),
+        line,
+        np.where(line_crit, SEVERITY_CRITICAL, SEVERITY_WARNING).astype(np.int8),
+    )
+
+
+if njit is not None:
+    scan = njit(cache=True)(_scan_loop)
+    # Compile (or load from the on-disk cache) at import, not on the first cycle
+    scan(np.ones(1), np.zeros(1))
+else:
+    scan = _scan_numpy
+
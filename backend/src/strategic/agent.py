@@ -7,23 +7,77 @@ Routes tool calls to ACTUAL server objects (sensors, actuators, coordinators).
 
 from __future__ import annotations
 
+import inspect
 import json
 import logging
+import re
 import uuid
-from datetime import datetime
-from typing import Any
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, NamedTuple
 
 import httpx
 
 from src.common.config import get_settings
-from src.common.llm_client import LLMClient, create_strategic_llm
+from src.common.llm_client import HTTP2_AVAILABLE, LLMClient, create_strategic_llm
 from src.common.models import AgentDecision
 from src.strategic.memory import ContextMemory
-from src.api.event_bus import event_bus
-import asyncio
+from src.api.event_bus import event_bus, now_iso
 
 logger = logging.getLogger(__name__)
 
+# Last tool catalog fetched from the registry, revalidated by ETag on startup
+TOOL_CACHE_FILE = Path.home() / ".cache" / "omninode" / "tools.json"
+
+# Registry tool names → LLM-safe function names in a single pass
+_TOOL_NAME_XLAT = str.maketrans({" ": "_", "(": "", ")": ""})
+
+# Tools kept in the focused escalation catalog (see StrategicAgent.actuator_tools)
+_ACTUATOR_SUFFIXES = ("actuate_device", "list_devices", "get_device_status")
+_ACTUATOR_KEYWORDS = ("actuator", "generator", "breaker", "load_controller", "regulator", "storage")
+
+# Tools without side effects: the only ones run concurrently within a turn
+_READ_ONLY_TOOLS = frozenset({
+    "get_zone_status", "detect_violations",
+    "read_sensor", "read_sensors_batch", "list_sensors", "get_metadata",
+    "validate_action", "get_status", "list_devices",
+})
+
+# Lexical compression for tool descriptions sent to the LLM: filler phrases and
+# articles carry no information for tool selection. A capital "A" is kept, as
+# it is usually a name ("phase A") rather than an article. Bracketed/braced
+# fragments (zone tags, schema snippets) are left untouched.
+_FILLER_RE = re.compile(
+    r"\b(?:(?i:this tool|use this to|used to|in order to|please|basically|simply|"
+    r"all available|at once|the|an)|a)\b\s*"
+)
+_PROTECTED_RE = re.compile(r"(\[[^\]]*\]|\{[^}]*\})")
+
+
+def _compress_description(text: str) -> str:
+    """Strip filler words from a tool description, keeping protected fragments verbatim."""
+    parts = _PROTECTED_RE.split(text)
+    for i in range(0, len(parts), 2):  # even indices are unprotected text
+        parts[i] = _FILLER_RE.sub("", parts[i])
+    compressed = " ".join("".join(parts).split())
+    return compressed or text
+
+
+_TERM_RE = re.compile(r"[a-z0-9_]{3,}")
+
+
+def _terms(text: str) -> set[str]:
+    """Lower-cased words of three or more characters, for relevance matching."""
+    return set(_TERM_RE.findall(text.lower()))
+
+
+class ToolInfo(NamedTuple):
+    """Routing entry for one LLM-facing tool name."""
+    server_id: str
+    original_name: str
+    fn: Callable[[dict], Any] | None  # None when no live server handles the tool
+
 
 class StrategicAgent:
     """LLM-powered strategic agent that controls the grid via MCP tools.
@@ -45,53 +99,79 @@ class StrategicAgent:
         self.memory = memory or ContextMemory()
         self._registry_url = settings.registry_url
         self._tools: list[dict] = []
-        self._tool_server_map: dict[str, str] = {}     # clean_tool_name -> server_id
-        self._tool_name_map: dict[str, str] = {}        # clean_tool_name -> original tool name
+        self._actuator_tools: list[dict] = []
+        self._tool_info: dict[str, ToolInfo] = {}       # clean_tool_name -> routing entry
         self._server_objects: dict[str, Any] = {}        # server_id -> server object
-        self._audit_log: list[AgentDecision] = []
+        self._dispatch: dict[tuple[str, str], Callable[[dict], Any]] = {}  # (server_id, tool) -> handler
+        self._audit_log: deque[AgentDecision] = deque(maxlen=1024)
         self.guardian = guardian
+        # Shared HTTP client so registry calls reuse pooled connections; HTTP/2
+        # lets parallel requests multiplex over one connection when available.
+        self._http = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
 
         # Register live server objects for direct tool execution
         if servers:
             for server in servers:
                 self._server_objects[server.server_id] = server
+                self._register_handlers(server)
 
         logger.info(
             "Strategic agent initialized → model=%s  servers=%d",
             self.llm.model, len(self._server_objects),
         )
 
+    async def aclose(self) -> None:
+        """Release the agent's pooled HTTP connections."""
+        await self._http.aclose()
+
     # ------------------------------------------------------------------
     # Tool discovery
     # ------------------------------------------------------------------
 
     async def discover_tools(self) -> int:
-        """Fetch all tools from the MCP Registry and build the tool catalog."""
+        """Fetch all tools from the MCP Registry and build the tool catalog.
+
+        The catalog is cached on disk together with the registry's ETag; when
+        the registry answers ``304 Not Modified`` the cached catalog is reused
+        instead of being downloaded and rebuilt.
+        """
+        cached = self._load_tool_cache()
+        headers = {"If-None-Match": cached["etag"]} if cached else {}
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(f"{self._registry_url}/tools")
-                resp.raise_for_status()
-                raw_tools = resp.json()
+            resp = await self._http.get(f"{self._registry_url}/tools", headers=headers)
+            if resp.status_code == 304 and cached:
+                self._tools = cached["tools"]
+                self._tool_info = {
+                    name: self._tool_entry(server_id, original_name)
+                    for name, (server_id, original_name) in cached["tool_info"].items()
+                }
+                self._actuator_tools = self._filter_actuator_tools()
+                logger.info("Tool catalog unchanged, loaded %d tools from cache", len(self._tools))
+                return len(self._tools)
+            resp.raise_for_status()
+            raw_tools = resp.json()
         except Exception as e:
             logger.error("Failed to discover tools: %s", e)
             return 0
 
         self._tools = []
-        self._tool_server_map = {}
-        self._tool_name_map = {}
+        self._tool_info = {}
 
         for tool in raw_tools:
-            clean_name = (
-                f"{tool['server_name']}_{tool['name']}"
-                .replace(" ", "_").replace("(", "").replace(")", "").lower()
-            )
+            clean_name = f"{tool['server_name']}_{tool['name']}".translate(_TOOL_NAME_XLAT).lower()
             original_name = tool["name"]
 
             tool_def = {
                 "type": "function",
                 "function": {
                     "name": clean_name,
-                    "description": f"[{tool['layer']}/{tool.get('zone', 'system')}] {tool['description']}",
+                    "description": _compress_description(
+                        f"[{tool['layer']}/{tool.get('zone', 'system')}] {tool['description']}"
+                    ),
                     "parameters": tool.get(
                         "input_schema",
                         {"type": "object", "properties": {}, "required": []},
@@ -99,25 +179,71 @@ class StrategicAgent:
                 },
             }
             self._tools.append(tool_def)
-            self._tool_server_map[clean_name] = tool["server_id"]
-            self._tool_name_map[clean_name] = original_name
+            self._tool_info[clean_name] = self._tool_entry(tool["server_id"], original_name)
 
+        self._actuator_tools = self._filter_actuator_tools()
+        self._save_tool_cache(resp.headers.get("etag"))
         logger.info(
             "Discovered %d tools from %d servers",
-            len(self._tools), len(set(self._tool_server_map.values())),
+            len(self._tools), len({info.server_id for info in self._tool_info.values()}),
         )
         return len(self._tools)
 
+    def _tool_entry(self, server_id: str, original_name: str) -> ToolInfo:
+        return ToolInfo(server_id, original_name, self._dispatch.get((server_id, original_name)))
+
+    def _load_tool_cache(self) -> dict | None:
+        """Return the cached catalog for this registry, if any."""
+        if not TOOL_CACHE_FILE.exists():
+            return None
+        try:
+            data = json.loads(TOOL_CACHE_FILE.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to load tool cache: %s", e)
+            return None
+        if (
+            data.get("registry_url") != self._registry_url
+            or not data.get("etag")
+            or "tool_info" not in data
+        ):
+            return None
+        return data
+
+    def _save_tool_cache(self, etag: str | None) -> None:
+        """Persist the current catalog keyed by the registry's ETag."""
+        if not etag:
+            return
+        data = {
+            "registry_url": self._registry_url,
+            "etag": etag,
+            "tools": self._tools,
+            "tool_info": {
+                name: [info.server_id, info.original_name] for name, info in self._tool_info.items()
+            },
+        }
+        try:
+            TOOL_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            TOOL_CACHE_FILE.write_text(json.dumps(data))
+        except OSError as e:
+            logger.warning("Failed to save tool cache: %s", e)
+
     @property
     def actuator_tools(self) -> list[dict]:
         """Return only actuator tools to avoid overflowing the LLM context window.
 
         Read-only sensor tools are irrelevant during emergency escalation and
         bloat the prompt (107 tools ≈ 21k tokens vs 5 actuators ≈ 2k tokens).
+        The list is computed once per catalog in ``discover_tools``.
         """
+        return self._actuator_tools
+
+    def _filter_actuator_tools(self) -> list[dict]:
         # Keep tools from actuator/physical servers only (not sensors or coordinators)
-        ACTUATOR_KEYWORDS = ("actuate_device", "list_devices", "get_device_status")
-        filtered = [t for t in self._tools if t["function"]["name"].split("_")[-1] in {"actuate_device", "list_devices", "get_device_status"} or any(k in t["function"]["name"] for k in ("actuator", "generator", "breaker", "load_controller", "regulator", "storage"))]
+        filtered = [
+            t for t in self._tools
+            if t["function"]["name"].endswith(_ACTUATOR_SUFFIXES)
+            or any(k in t["function"]["name"] for k in _ACTUATOR_KEYWORDS)
+        ]
         if not filtered:
             # Fallback: any tool whose description mentions actuating
             filtered = [t for t in self._tools if "actuate" in t["function"].get("description", "").lower()]
@@ -138,15 +264,15 @@ class StrategicAgent:
         """
         recent_decisions = self.memory.get_recent_decisions(5)
         context_summary = self.memory.get_context_summary()
-        context_block = self._build_context(context_summary, recent_decisions)
+        context_block = self._build_context(context_summary, recent_decisions, user_message)
 
         full_message = f"{context_block}\n\n{user_message}" if context_block else user_message
 
-        asyncio.create_task(event_bus.publish("agent_log", {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+        event_bus.publish_nowait("agent_log", {
+            "timestamp": now_iso(),
             "level": "analyzing",
             "message": f"Processing user query: {user_message[:200]}"
-        }))
+        })
 
         # Use focused actuator tools during escalation to avoid context overflow
         tools_to_use = self.actuator_tools if escalation else self._tools
@@ -157,6 +283,7 @@ class StrategicAgent:
             tools=tools_to_use,
             tool_executor=self._execute_tool,
             tool_choice="required" if escalation and tools_to_use else None,
+            is_read_only=self._is_read_only,
         )
 
         decision = AgentDecision(
@@ -167,130 +294,160 @@ class StrategicAgent:
         self._audit_log.append(decision)
         self.memory.store_decision(decision)
 
-        asyncio.create_task(event_bus.publish("agent_log", {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+        event_bus.publish_nowait("agent_log", {
+            "timestamp": now_iso(),
             "level": "decision",
             "message": final_text or "(tool calls executed — no summary text)"
-        }))
+        })
 
         return final_text
 
+    def _is_read_only(self, tool_name: str) -> bool:
+        info = self._tool_info.get(tool_name)
+        return info is not None and info.original_name in _READ_ONLY_TOOLS
+
     async def _execute_tool(self, tool_name: str, arguments: dict) -> dict:
         """Execute a tool call by routing to the actual in-process server object."""
-        logger.info("Tool call: %s(%s)", tool_name, json.dumps(arguments, default=str)[:200])
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Tool call: %s(%s)", tool_name, json.dumps(arguments, default=str)[:200])
         
-        asyncio.create_task(event_bus.publish("agent_log", {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+        event_bus.publish_nowait("agent_log", {
+            "timestamp": now_iso(),
             "level": "tool_call",
             "message": f"Calling component: {tool_name}",
             "data": arguments
-        }))
-
-        server_id = self._tool_server_map.get(tool_name)
-        original_name = self._tool_name_map.get(tool_name, tool_name)
+        })
 
-        if not server_id:
+        info = self._tool_info.get(tool_name)
+        if info is None:
             return {"error": f"Tool '{tool_name}' not found in registry"}
 
-        # Look up the actual server object
-        server = self._server_objects.get(server_id)
-        if not server:
-            logger.warning("No live server for %s (%s), returning stub", tool_name, server_id)
-            return {
-                "status": "no_live_server",
-                "tool": tool_name,
-                "server_id": server_id,
-                "message": "Server not available for direct execution",
-            }
+        if info.fn is None:
+            # Look up the actual server object
+            server = self._server_objects.get(info.server_id)
+            if not server:
+                logger.warning("No live server for %s (%s), returning stub", tool_name, info.server_id)
+                return {
+                    "status": "no_live_server",
+                    "tool": tool_name,
+                    "server_id": info.server_id,
+                    "message": "Server not available for direct execution",
+                }
+            return {"error": f"Unknown tool '{info.original_name}' on server {server.name}"}
 
         try:
             # All our servers register tools via MCP's call_tool decorator.
             # We invoke them through the server's internal methods.
-            result = await self._call_server_tool(server, original_name, arguments)
-            logger.info("Tool result [%s]: %s", tool_name, json.dumps(result, default=str)[:300])
+            result = info.fn(arguments)
+            if inspect.isawaitable(result):
+                result = await result
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Tool result [%s]: %s", tool_name, json.dumps(result, default=str)[:300])
             return result
         except Exception as e:
             logger.error("Tool execution failed [%s]: %s", tool_name, e)
             return {"error": str(e), "tool": tool_name}
 
-    async def _call_server_tool(self, server: Any, tool_name: str, arguments: dict) -> dict:
-        """Route a tool call to the correct handler method on the server object.
+    def _register_handlers(self, server: Any) -> None:
+        """Build the tool dispatch entries for one server object.
 
-        Handles sensors, actuators, and coordinators by inspecting
-        the server type and calling the appropriate internal method.
+        Handles sensors, actuators, and coordinators by inspecting the server
+        type once here; ``discover_tools`` binds these handlers into ``ToolInfo``
+        entries so each tool call is a single lookup.
         """
+        handlers: dict[str, Callable[[dict], Any]] = {}
+        s = server
+
         # ---- Zone Coordinator ----
-        if hasattr(server, "zone_id"):
-            if tool_name == "get_zone_status":
-                return server._get_zone_status()
-            elif tool_name == "optimize_zone_topology":
-                return server.optimizer.optimize(arguments.get("objective", "min_losses"))
-            elif tool_name == "handle_violation":
-                return server._handle_violation(arguments)
-            elif tool_name == "load_balancing":
-                return server.optimizer.balance_loading(arguments.get("target_balance", 80))
-            elif tool_name == "voltage_regulation":
-                return server.optimizer.regulate_voltage(arguments.get("target_pu", 1.0))
-            elif tool_name == "emergency_islanding":
-                return server._emergency_island(arguments.get("reason", ""))
-            elif tool_name == "detect_violations":
-                return server._detect_violations()
-            elif tool_name == "analyze_and_act":
+        if hasattr(s, "zone_id"):
+            handlers.update({
+                "get_zone_status": lambda a: s._get_zone_status(),
+                "optimize_zone_topology": lambda a: s.optimizer.optimize(a.get("objective", "min_losses")),
+                "handle_violation": lambda a: s._handle_violation(a),
+                "load_balancing": lambda a: s.optimizer.balance_loading(a.get("target_balance", 80)),
+                "voltage_regulation": lambda a: s.optimizer.regulate_voltage(a.get("target_pu", 1.0)),
+                "emergency_islanding": lambda a: s._emergency_island(a.get("reason", "")),
+                "detect_violations": lambda a: s._detect_violations(),
                 # THIS triggers the zone's own LLM!
-                return server._llm_analyze(arguments.get("situation", ""))
+                "analyze_and_act": lambda a: s._llm_analyze(a.get("situation", "")),
+            })
 
         # ---- Sensor ----
-        if hasattr(server, "sensor_type"):
-            if tool_name == "read_sensor":
-                return server._handle_read(arguments.get("sensor_id", ""))
-            elif tool_name == "read_sensors_batch":
-                return server._handle_batch_read(arguments.get("sensor_ids", []))
-            elif tool_name == "list_sensors":
-                return {"sensors": server._get_sensor_ids(), "type": server.sensor_type, "zone": server.zone}
-            elif tool_name == "set_threshold":
-                return server._handle_set_threshold(arguments)
-            elif tool_name == "get_metadata":
-                return server._get_sensor_metadata(arguments.get("sensor_id", ""))
+        if hasattr(s, "sensor_type"):
+            for name, fn in {
+                "read_sensor": lambda a: s._handle_read(a.get("sensor_id", "")),
+                "read_sensors_batch": lambda a: s._handle_batch_read(a.get("sensor_ids", [])),
+                "list_sensors": lambda a: {"sensors": s._get_sensor_ids(), "type": s.sensor_type, "zone": s.zone},
+                "set_threshold": lambda a: s._handle_set_threshold(a),
+                "get_metadata": lambda a: s._get_sensor_metadata(a.get("sensor_id", "")),
+            }.items():
+                handlers.setdefault(name, fn)
 
         # ---- Actuator ----
-        if hasattr(server, "device_type"):
-            if tool_name == "control":
-                if self.guardian:
-                    # Run safety validation (which also publishes the event to UI)
-                    validation = await self.guardian.validate_command(arguments)
-                    if not validation.get("safe", False):
-                        logger.warning("Guardian intercepted and blocked action: %s", arguments)
-                        return {
-                            "executed": False,
-                            "reason": "Validation failed — action would cause violations",
-                            "validation": validation
-                        }
-                return server._handle_control(arguments)
-            elif tool_name == "validate_action":
-                return server._handle_validate(arguments)
-            elif tool_name == "get_status":
-                return server._get_device_status(arguments.get("device_id", ""))
-            elif tool_name == "list_devices":
-                return {"devices": server._get_device_ids(), "type": server.device_type, "zone": server.zone}
-            elif tool_name == "emergency_shutdown":
-                return server._handle_emergency(arguments.get("zone_id", ""))
-
-        return {"error": f"Unknown tool '{tool_name}' on server {server.name}"}
+        if hasattr(s, "device_type"):
+            for name, fn in {
+                "control": lambda a: self._guarded_control(s, a),
+                "validate_action": lambda a: s._handle_validate(a),
+                "get_status": lambda a: s._get_device_status(a.get("device_id", "")),
+                "list_devices": lambda a: {"devices": s._get_device_ids(), "type": s.device_type, "zone": s.zone},
+                "emergency_shutdown": lambda a: s._handle_emergency(a.get("zone_id", "")),
+            }.items():
+                handlers.setdefault(name, fn)
+
+        for name, fn in handlers.items():
+            self._dispatch[(server.server_id, name)] = fn
+
+    async def _guarded_control(self, server: Any, arguments: dict) -> dict:
+        """Execute an actuator command after the guardian has cleared it."""
+        if self.guardian:
+            # Run safety validation (which also publishes the event to UI)
+            validation = await self.guardian.validate_command(arguments)
+            if not validation.get("safe", False):
+                logger.warning("Guardian intercepted and blocked action: %s", arguments)
+                return {
+                    "executed": False,
+                    "reason": "Validation failed — action would cause violations",
+                    "validation": validation
+                }
+        return server._handle_control(arguments)
 
     # ------------------------------------------------------------------
     # Context
     # ------------------------------------------------------------------
 
-    def _build_context(self, context: str, recent_decisions: list[dict]) -> str:
+    def _build_context(self, context: str, recent_decisions: list[dict], query: str = "") -> str:
         parts = []
         if context:
             parts.append(context)
-        if recent_decisions:
+        relevant = self._relevant_decisions(recent_decisions, query)
+        if relevant:
             parts.append(
-                "Recent decisions:\n" + json.dumps(recent_decisions[:3], indent=2, default=str)
+                "Recent decisions:\n" + json.dumps(relevant, separators=(",", ":"), default=str)
             )
         return "\n\n".join(parts)
 
+    @staticmethod
+    def _relevant_decisions(decisions: list[dict], query: str, limit: int = 3) -> list[dict]:
+        """Keep the decisions sharing the most terms with the query, newest first.
+
+        Falls back to the latest decision when none overlap. Empty fields are
+        dropped so they don't cost prompt tokens; records stay valid JSON.
+        """
+        if not decisions:
+            return []
+        query_terms = _terms(query)
+        scored = [
+            (len(query_terms & _terms(f"{d.get('trigger', '')} {d.get('reasoning', '')}")), i)
+            for i, d in enumerate(decisions)
+        ]
+        picked = [i for score, i in sorted(scored, key=lambda s: (-s[0], s[1])) if score > 0][:limit]
+        if not picked:
+            picked = [0]
+        return [
+            {k: v for k, v in decisions[i].items() if v not in (None, "", "[]")}
+            for i in sorted(picked)
+        ]
+
     # ------------------------------------------------------------------
     # Audit
     # ------------------------------------------------------------------
@@ -5,6 +5,9 @@ from __future__ import annotations
 import asyncio
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 from src.common.config import get_settings
 from src.simulation.power_grid import PowerGridSimulation
@@ -58,11 +61,14 @@ async def run_cli() -> None:
     monitor = MonitoringLoop(grid, agent, coordinators=coordinators)
     monitor_task: asyncio.Task | None = None
 
+    # Blocking input() gets its own thread so it never occupies the default
+    # executor that other async work (LLM calls, zone rules) relies on.
+    loop = asyncio.get_running_loop()
+    stdin_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cli-stdin")
+
     while True:
         try:
-            user_input = await asyncio.get_event_loop().run_in_executor(
-                None, lambda: input("🔌 > ").strip()
-            )
+            user_input = (await loop.run_in_executor(stdin_executor, input, "🔌 > ")).strip()
         except (EOFError, KeyboardInterrupt):
             print("\nGoodbye!")
             break
@@ -146,6 +152,9 @@ async def run_cli() -> None:
             except Exception as e:
                 print(f"  Error: {e}\n")
 
+    stdin_executor.shutdown(wait=False, cancel_futures=True)
+    await agent.aclose()
+
 
 def _print_system_status(grid: PowerGridSimulation) -> None:
     print("\n  === System Status ===")
@@ -154,30 +163,32 @@ def _print_system_status(grid: PowerGridSimulation) -> None:
     print(f"  Total Losses:     {grid.get_total_losses():.3f} MW")
     print(f"  Frequency:        {grid.get_frequency():.4f} Hz")
 
-    voltages = grid.get_bus_voltages()
-    loadings = grid.get_line_loadings()
-    print(f"  Voltage range:    {min(voltages.values()):.4f} - {max(voltages.values()):.4f} p.u.")
-    print(f"  Max line loading: {max(loadings.values()):.1f}%")
+    voltages = grid.get_bus_voltages_array()
+    loadings = grid.get_line_loadings_array()
+    print(f"  Voltage range:    {voltages.min():.4f} - {voltages.max():.4f} p.u.")
+    print(f"  Max line loading: {loadings.max():.1f}%")
 
-    v_violations = sum(1 for v in voltages.values() if v < 0.95 or v > 1.05)
-    t_violations = sum(1 for l in loadings.values() if l > 100)
+    v_violations = int(((voltages < 0.95) | (voltages > 1.05)).sum())
+    t_violations = int((loadings > 100).sum())
     print(f"  Violations:       {v_violations} voltage, {t_violations} thermal")
     print()
 
 
 def _print_zone_summary(grid: PowerGridSimulation) -> None:
     zone_buses = grid.get_zone_buses()
+    all_voltages = grid.get_bus_voltages_array()
+    bus_index = grid.net.res_bus.index
+    load_p = grid.net.load.p_mw.to_numpy(dtype=float)
+    load_bus = grid.net.load.bus.to_numpy()
     print("\n  === Zone Summary ===")
     for zone, buses in zone_buses.items():
-        voltages = [grid.get_bus_voltage(b) for b in buses]
-        avg_v = sum(voltages) / len(voltages)
-        min_v = min(voltages)
-        max_v = max(voltages)
+        voltages = all_voltages[bus_index.get_indexer(buses)]
+        min_v = voltages.min()
+        max_v = voltages.max()
 
-        zone_loads = grid.net.load[grid.net.load.bus.isin(buses)]
-        total_load = float(zone_loads.p_mw.sum()) if len(zone_loads) > 0 else 0
+        total_load = float(load_p[np.isin(load_bus, buses)].sum())
 
-        violations = sum(1 for v in voltages if v < 0.95 or v > 1.05)
+        violations = int(((voltages < 0.95) | (voltages > 1.05)).sum())
         health = "🔴" if violations > 2 else "🟡" if violations > 0 else "🟢"
 
         print(f"  {health} {zone}: V={min_v:.3f}-{max_v:.3f} p.u. | Load={total_load:.1f} MW | Violations={violations}")
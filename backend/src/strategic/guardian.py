@@ -6,15 +6,53 @@ proposed grid actions are safe before execution.
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
-import asyncio
+import re
+from collections import OrderedDict, deque
 
+from src.api.event_bus import event_bus, now_iso
+from src.common.config import get_settings
 from src.common.llm_client import LLMClient, create_guardian_llm
-from src.api.event_bus import event_bus
+from src.common.models import GuardianVerdict
 
 logger = logging.getLogger(__name__)
 
+_PROMPT_TMPL = """Evaluate the safety of the following power grid command:
+
+Action: {action}
+Target: {target}
+Parameters: {parameters}
+
+Grid Context:
+{context}
+
+Respond ONLY with a JSON object:
+{{"safe": true/false, "risk_level": "LOW|MEDIUM|HIGH|CRITICAL", "reasoning": "...", "conditions": [...]}}"""
+
+# Markdown code fences around the model's answer, and the JSON object inside it
+_FENCE_RE = re.compile(r"^```[\w-]*\s*|\s*```$")
+_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+# Lenient repairs for almost-JSON: comments, trailing commas, Python literals
+_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_PY_LITERAL_RE = re.compile(r"\b(True|False|None)\b")
+# Replies longer than this are parsed in a worker thread
+_OFFLOAD_PARSE_CHARS = 512
+
+# Verdicts remembered per (action, target, parameters); only safe LOW/MEDIUM
+# verdicts are cached so risky commands are always re-evaluated.
+_CACHE_SIZE = 512
+# Read-only actions have no side effects and never need the safety model
+_SAFE_ACTIONS = frozenset({
+    "get_status", "list_devices", "get_zone_status",
+    "read_sensor", "read_sensors_batch", "get_metadata",
+})
+_CACHEABLE_RISK = frozenset({"LOW", "MEDIUM"})
+
 
 class SafetyGuardian:
     """Validates actuator commands using a dedicated safety LLM.
@@ -25,7 +63,9 @@ class SafetyGuardian:
 
     def __init__(self, llm: LLMClient | None = None):
         self.llm = llm or create_guardian_llm()
-        self._validation_log: list[dict] = []
+        self._validation_log: deque[dict] = deque(maxlen=50)
+        self._json_mode = get_settings().guardian_json_mode
+        self._cache: OrderedDict[str, dict] = OrderedDict()
         logger.info("Safety Guardian initialized → model=%s", self.llm.model)
 
     async def validate_command(self, command: dict) -> dict:
@@ -41,7 +81,113 @@ class SafetyGuardian:
         Returns:
             Dict with 'safe' (bool), 'risk_level', 'reasoning', 'conditions'.
         """
-        # Sanitize command fields from common LLM hallucinations before processing or UI broadcast
+        self._sanitize(command)
+
+        if command["action"] in _SAFE_ACTIONS:
+            result = {"safe": True, "risk_level": "LOW", "reasoning": "Read-only action.", "conditions": []}
+            self._record(command, result)
+            return result
+
+        key = self._cache_key(command)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            logger.debug("[Guardian] cache hit for %s %s", command.get("action"), command.get("target"))
+            result = dict(cached)
+            self._record(command, result)
+            return result
+
+        parameters = command.get("parameters")
+        prompt = _PROMPT_TMPL.format_map({
+            "action": command.get("action", "unknown"),
+            "target": command.get("target", "unknown"),
+            "parameters": json.dumps(parameters, default=str) if parameters else "{}",
+            "context": command.get("context", "No context provided"),
+        })
+
+        raw = ""
+        try:
+            raw = await self.llm.complete(prompt, temperature=0.1, json_mode=self._json_mode)
+            if len(raw) > _OFFLOAD_PARSE_CHARS:
+                # Keep the loop responsive while large replies are parsed
+                result = await asyncio.to_thread(self._parse_response, raw)
+            else:
+                result = self._parse_response(raw)
+        except Exception as e:
+            logger.warning("Guardian response not parseable: %s — raw: %s", e, raw[:200])
+            result = {
+                "safe": False,
+                "risk_level": "HIGH",
+                "reasoning": f"Guardian could not evaluate: {e}",
+                "conditions": ["Manual review required"],
+            }
+
+        if result.get("safe") is True and result.get("risk_level") in _CACHEABLE_RISK:
+            self._cache[key] = dict(result)
+            if len(self._cache) > _CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+        self._record(command, result)
+        return result
+
+    async def validate_commands(self, commands: list[dict]) -> list[dict]:
+        """Evaluate several commands concurrently.
+
+        The guardian LLM calls are issued together, so a batch costs roughly one
+        round-trip instead of one per command. Results are aligned with
+        ``commands``. How many requests Ollama actually serves in parallel is
+        bounded by its ``OLLAMA_NUM_PARALLEL`` setting; the rest queue server-side.
+        """
+        return list(await asyncio.gather(*(self.validate_command(c) for c in commands)))
+
+    @staticmethod
+    def _parse_response(raw: str) -> dict:
+        """Turn the guardian model's reply into a verdict dict.
+
+        A bare ``safe``/``unsafe`` answer (llama-guard style) is mapped
+        directly. Anything else is decoded as JSON and validated as a
+        :class:`GuardianVerdict`; fenced or prose-wrapped JSON from models run
+        without JSON mode (``guardian_json_mode`` off) is accepted.
+        """
+        clean = _FENCE_RE.sub("", raw.strip())
+        first_line = clean.split("\n", 1)[0].strip().lower()
+        if first_line == "safe":
+            return {"safe": True, "risk_level": "LOW", "reasoning": "Action evaluated as safe.", "conditions": []}
+        if first_line.startswith("unsafe"):
+            return {"safe": False, "risk_level": "HIGH", "reasoning": f"Action blocked by safeguard model: {clean}", "conditions": []}
+        return GuardianVerdict.model_validate(SafetyGuardian._load_json(clean)).model_dump()
+
+    @staticmethod
+    def _load_json(text: str) -> object:
+        """Decode the reply in stages, so almost-JSON doesn't waste the LLM call.
+
+        1. strict JSON; 2. the outermost ``{...}`` inside surrounding prose;
+        3. that object with comments, trailing commas and Python literals
+        repaired. If all fail, the last ``JSONDecodeError`` propagates.
+        """
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
+        match = _OBJECT_RE.search(text)
+        if match:
+            text = match.group(0)
+            try:
+                obj = json.loads(text)
+                logger.debug("[Guardian] reply parsed after extracting the JSON object")
+                return obj
+            except json.JSONDecodeError:
+                pass
+        repaired = _COMMENT_RE.sub("", text)
+        repaired = _TRAILING_COMMA_RE.sub(r"\1", repaired)
+        repaired = _PY_LITERAL_RE.sub(lambda m: _PY_LITERALS[m.group(1)], repaired)
+        obj = json.loads(repaired)
+        logger.debug("[Guardian] reply parsed after lenient repair")
+        return obj
+
+    @staticmethod
+    def _sanitize(command: dict) -> None:
+        """Sanitize command fields from common LLM hallucinations, in place."""
         raw_action = command.get("action", "")
         # Fallback: if 'action' wasn't explicitly provided, search other keys like 'status', 'operation'
         if not raw_action:
@@ -54,45 +200,18 @@ class SafetyGuardian:
         raw_target = command.get("device_id", command.get("target", "unknown"))
         command["device_id"] = str(raw_target.get("id", raw_target) if isinstance(raw_target, dict) else raw_target)
         command["target"] = command["device_id"]
-        
-        prompt = f"""Evaluate the safety of the following power grid command:
-
-Action: {command.get('action', 'unknown')}
-Target: {command.get('target', 'unknown')}
-Parameters: {json.dumps(command.get('parameters', {}), default=str)}
-
-Grid Context:
-{command.get('context', 'No context provided')}
-
-Respond ONLY with a JSON object (no markdown):
-{{"safe": true/false, "risk_level": "LOW|MEDIUM|HIGH|CRITICAL", "reasoning": "...", "conditions": [...]}}"""
 
-        try:
-            raw = await self.llm.complete(prompt, temperature=0.1)
-            # Try to parse JSON from the response
-            # Strip any markdown code fences
-            clean = raw.strip()
-            if clean.startswith("```"):
-                clean = clean.split("\n", 1)[1] if "\n" in clean else clean
-                clean = clean.rsplit("```", 1)[0] if "```" in clean else clean
-                clean = clean.strip()
-
-            lower_clean = clean.lower()
-            if lower_clean == "safe" or lower_clean.startswith("safe\n"):
-                result = {"safe": True, "risk_level": "LOW", "reasoning": "Action evaluated as safe.", "conditions": []}
-            elif lower_clean.startswith("unsafe"):
-                result = {"safe": False, "risk_level": "HIGH", "reasoning": f"Action blocked by safeguard model: {clean}", "conditions": []}
-            else:
-                result = json.loads(clean)
-        except (json.JSONDecodeError, Exception) as e:
-            logger.warning("Guardian response not parseable: %s — raw: %s", e, raw[:200] if 'raw' in dir() else "N/A")
-            result = {
-                "safe": False,
-                "risk_level": "HIGH",
-                "reasoning": f"Guardian could not evaluate: {e}",
-                "conditions": ["Manual review required"],
-            }
+    @staticmethod
+    def _cache_key(command: dict) -> str:
+        """Canonical hash of the command, excluding the free-form grid context."""
+        canonical = json.dumps(
+            {"a": command.get("action"), "t": command.get("target"), "p": command.get("parameters", {})},
+            sort_keys=True, default=str,
+        )
+        return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
 
+    def _record(self, command: dict, result: dict) -> None:
+        """Append to the validation log and publish the guardian event."""
         entry = {"command": command, "result": result}
         self._validation_log.append(entry)
         logger.info(
@@ -103,25 +222,21 @@ Respond ONLY with a JSON object (no markdown):
         
         # Publish event
         try:
-            from datetime import datetime
             event_payload = {
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": now_iso(),
                 "command": command,
                 "safe": result.get("safe", False),
                 "risk_level": result.get("risk_level", "HIGH"),
                 "reasoning": result.get("reasoning", ""),
                 "conditions": result.get("conditions", [])
             }
-            # Try to publish if there's a running event loop
-            loop = asyncio.get_running_loop()
-            loop.create_task(event_bus.publish("guardian_event", event_payload))
+            # Requires a running event loop
+            event_bus.publish_nowait("guardian_event", event_payload)
         except RuntimeError:
             # We might not be in an event loop (e.g., synchronous tests)
             pass
         except Exception as e:
             logger.error(f"Failed to publish guardian_event: {e}")
 
-        return result
-
     def get_validation_log(self) -> list[dict]:
-        return self._validation_log[-50:]
+        return list(self._validation_log)
@@ -4,7 +4,7 @@ Each cycle:
   1. Run power flow → detect violations
   2. Group violations by zone
   3. Trigger deterministic safety rules via Zone PLC Coordinators IN PARALLEL
-4. Escalate to strategic agent ONLY for cross-zone / unresolved issues
+  4. Escalate to strategic agent ONLY for cross-zone / unresolved issues
 """
 
 from __future__ import annotations
@@ -12,14 +12,17 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from collections import defaultdict
-from datetime import datetime
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
 
 import pandas as pd
 
 from src.common.config import get_settings
 from src.common.models import ViolationEvent
 from src.coordination.zone_coordinator import ZoneCoordinator
+from src.simulation import violations_kernel
 from src.simulation.power_grid import PowerGridSimulation
 from src.simulation.data_generator import DataGenerator
 from src.strategic.agent import StrategicAgent
@@ -27,6 +30,14 @@ from src.api.event_bus import event_bus
 
 logger = logging.getLogger(__name__)
 
+_BLACKOUT_DIRECTIVE = (
+    "🚨 CRITICAL BLACKOUT: AC Power Flow Divergence. The grid topology is mathematically unstable. "
+    "Standard generator ramping will FAIL.\n\n"
+    "YOUR ONLY OPTIONS TO RESTORE THE GRID ARE:\n"
+    "1. Identify tripped lines (open circuit breakers) and CLOSE them.\n"
+    "2. If no lines are tripped, SHED at least 40% of all load immediately."
+)
+
 
 class MonitoringLoop:
     """Async monitoring loop with zone-first violation handling.
@@ -46,14 +57,32 @@ class MonitoringLoop:
         self.agent = agent
         self.data_gen = data_gen
         self._running = False
-        self._violations_history: list[ViolationEvent] = []
+        # Serialized tail served by get_violation_history(), dumped once on write
+        self._violations_history_json: deque[dict] = deque(maxlen=50)
         self._cycle_count = 0
+        # Bus topology is fixed for the life of the loop: resolve zones once
+        self._zone_lut: dict[int, str] = {
+            int(b): self._bus_to_zone(int(b)) for b in self.grid.net.bus.index
+        }
 
         # Zone coordinator lookup
         self._coordinators: dict[str, ZoneCoordinator] = {}
         if coordinators:
             for c in coordinators:
                 self._coordinators[c.zone_id] = c
+        # Every zone a violation can be tagged with is known up front
+        self._zone_keys: tuple[str, ...] = tuple(
+            dict.fromkeys([*self._coordinators, *self._zone_lut.values(), "system"])
+        )
+        # Created by start(): the loop can be stopped and started again
+        self._plc_executor: ThreadPoolExecutor | None = None
+        # Device ID lists for directives, rebuilt only when the element counts change
+        self._inventory_cache: dict | None = None
+        self._inventory_topology_key: tuple[int, int, int] | None = None
+        # Element tables keep their columns for the life of the net
+        self._has_max_p = "max_p_mw" in self.grid.net.gen.columns
+        # Cycle in progress, cancelled by stop() (with any escalation it awaits)
+        self._cycle_task: asyncio.Task | None = None
 
         settings = get_settings()
         self.interval = settings.monitor_interval_seconds
@@ -61,53 +90,71 @@ class MonitoringLoop:
     async def start(self) -> None:
         """Start the monitoring loop."""
         self._running = True
+        # The per-cycle power flow and the PLC rules (which also solve and
+        # write SQLite audit rows) block, so they keep a thread hop, but on a
+        # pool of their own: one worker per zone, never queued behind
+        # unrelated to_thread() calls.
+        self._plc_executor = ThreadPoolExecutor(
+            max_workers=max(2, len(self._coordinators)),
+            thread_name_prefix="zone_plc",
+        )
         logger.info(
             "Monitoring loop started (interval=%ds, zones=%d)",
             self.interval, len(self._coordinators),
         )
 
         while self._running:
+            self._cycle_task = asyncio.create_task(self._check_cycle())
             try:
-                await self._check_cycle()
+                await self._cycle_task
+            except asyncio.CancelledError:
+                if self._running:
+                    raise
+                break
             except Exception as e:
                 logger.error("Monitor cycle error: %s", e)
+            finally:
+                self._cycle_task = None
 
             await asyncio.sleep(self.interval)
 
     async def stop(self) -> None:
         """Stop the monitoring loop."""
         self._running = False
+        if self._cycle_task is not None:
+            self._cycle_task.cancel()
+        if self._plc_executor is not None:
+            self._plc_executor.shutdown(wait=False)
+            self._plc_executor = None
         logger.info("Monitoring loop stopped")
 
     async def _check_cycle(self) -> None:
         """One monitoring cycle: detect → zone-dispatch → escalate if needed."""
         self._cycle_count += 1
 
-        # Vary loads slightly each cycle for realism
-        if self.data_gen:
-            self.data_gen.vary_loads()
-
-        # Run power flow
-        self.grid.run_power_flow()
-
-        # Detect violations
-        violations = self._detect_all_violations()
+        # Load variation, power flow and the violation scan are CPU-bound;
+        # run them off the event loop so WebSocket/API handlers stay responsive.
+        # They share the monitor's grid-work pool with the zone PLCs (the
+        # default executor is used if the loop was never started).
+        loop = asyncio.get_running_loop()
+        violations = await loop.run_in_executor(self._plc_executor, self._advance_and_detect)
         zone_violations = self._group_by_zone(violations)
 
-        # --- Publish to WebSocket via Event Bus (Always publish state for UI) ---
-        try:
-            # Simple zone health eval for demo UI
-            zone_health = {}
-            for z_id in self._coordinators.keys():
-                z_viols = len(zone_violations.get(z_id, []))
-                zone_health[z_id] = "critical" if z_viols > 2 else "warning" if z_viols > 0 else "healthy"
+        # --- Publish to WebSocket via Event Bus (UI only: skipped with no clients) ---
+        if event_bus.subscriber_count("grid_state"):
+            try:
+                # Simple zone health eval for demo UI
+                zone_health = {
+                    z_id: self._zone_health_label(len(zone_violations.get(z_id, ())))
+                    for z_id in self._coordinators
+                }
 
-            payload = self.grid.get_state(zone_health=zone_health)
+                payload = self.grid.get_state(zone_health=zone_health)
 
-            asyncio.create_task(event_bus.publish("grid_state", payload))
-            logger.debug("Published simulated grid state to EventBus")
-        except Exception as e:
-            logger.error("Failed to publish grid state: %s", e)
+                event_bus.publish_nowait("grid_state", payload)
+                logger.debug("Published simulated grid state to EventBus")
+            except Exception as e:
+                logger.error("Failed to publish grid state: %s", e)
 
         if not violations:
             if self._cycle_count % 6 == 0:  # Log every ~3 min at 30s interval
@@ -115,7 +162,9 @@ class MonitoringLoop:
             return
 
         logger.warning("Cycle %d: %d violations detected", self._cycle_count, len(violations))
-        self._violations_history.extend(violations)
+        self._violations_history_json.extend(
+            v.model_dump(mode="json") for v in violations[-50:]
+        )
 
         # --- Zone-first dispatch ---
         zone_results = {}
@@ -133,37 +182,48 @@ class MonitoringLoop:
                 # No coordinator for this zone — escalate immediately
                 escalations.extend(zone_viols)
 
-        # Wait for all zone PLC events to execute (fast)
+        # Wait for all zone PLC events to execute (fast) under one shared
+        # budget, so a stalled zone doesn't delay reading the others
+        pending = set()
+        if tasks:
+            _, pending = await asyncio.wait(tasks.values(), timeout=10)
+            for task in pending:
+                task.cancel()
+
         for zone_id, task in tasks.items():
+            if task in pending:
+                logger.warning("Zone %s PLC timed out", zone_id)
+                escalations.extend(zone_violations[zone_id])
+                continue
             try:
-                result = await asyncio.wait_for(task, timeout=10)
+                result = task.result()
                 zone_results[zone_id] = result
-                logger.debug(
-                    "Zone %s PLC executed: %s",
-                    zone_id,
-                    json.dumps(result, default=str)[:300],
-                )
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Zone %s PLC executed: %s",
+                        zone_id,
+                        json.dumps(result, default=str)[:300],
+                    )
 
                 # Check if zone PLC is escalating (via deadband)
                 if result.get("status") == "escalation_required":
                     escalations.extend(zone_violations[zone_id])
                     logger.warning("Zone %s PLC escalating issues to Strategic Agent", zone_id)
 
-            except asyncio.TimeoutError:
-                logger.warning("Zone %s PLC timed out", zone_id)
-                escalations.extend(zone_violations[zone_id])
             except Exception as e:
                 logger.error("Zone %s PLC error: %s", zone_id, e)
                 escalations.extend(zone_violations[zone_id])
 
         # --- Strategic escalation (only if needed) ---
-        if escalations and len(escalations) >= 1:
+        if escalations:
             logger.info(
                 "Escalating %d violations to strategic agent...", len(escalations)
             )
             try:
                 # Build a directive prompt with pre-computed recommendations
                 directive = self._build_directive(escalations, zone_results)
+                # Awaited within the cycle: the agent's tools mutate the grid, so
+                # the next cycle's power flow must not run until the call finishes
                 response = await asyncio.wait_for(
                     self.agent.query(directive, escalation=True),
                     timeout=300,
@@ -174,73 +234,97 @@ class MonitoringLoop:
             except Exception as e:
                 logger.error("Strategic agent error: %s", e)
 
-        # Strategic escalation block ends here
+    def _advance_and_detect(self) -> list[ViolationEvent]:
+        """Vary loads, solve the power flow and return the resulting violations."""
+        # Vary loads slightly each cycle for realism
+        if self.data_gen:
+            self.data_gen.vary_loads()
+        # Quiet periods leave the inputs untouched: skip the redundant solve
+        if not self.grid.solution_is_current():
+            self.grid.run_power_flow()
+        return self._detect_all_violations()
 
     async def _trigger_zone_rules(self, coordinator: ZoneCoordinator) -> dict:
         """Trigger deterministic PLC safety rules in a zone."""
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         return await loop.run_in_executor(
-            None, coordinator._evaluate_safety_rules
+            self._plc_executor, coordinator._evaluate_safety_rules
         )
 
     def _detect_all_violations(self) -> list[ViolationEvent]:
         """Check all grid constraints and return violations."""
         violations = []
-        now = datetime.utcnow()
+        t_ns = time.time_ns()
+        now = datetime.fromtimestamp(t_ns / 1e9, tz=UTC)
+        ts = str(t_ns // 1_000_000_000)  # shared by every violation id this cycle
+
+        # Compiled scan over the result arrays; only the (few) hits are
+        # turned into ViolationEvent objects below. Every field is built here
+        # from typed grid values, so the events skip pydantic validation.
+        vm = self.grid.get_bus_voltages_array()
+        loading = self.grid.get_line_loadings_array()
+        bus_pos, bus_sev, line_pos, line_sev = violations_kernel.scan(vm, loading)
+        bus_ids = self.grid.net.res_bus.index
+        line_ids = self.grid.net.res_line.index
 
         # Voltage violations
-        for bus_id, vm in self.grid.get_bus_voltages().items():
-            if vm < 0.95:
-                violations.append(ViolationEvent(
-                    violation_id=f"v_low_{bus_id}_{now.timestamp():.0f}",
-                    violation_type="voltage",
-                    zone=self._bus_to_zone(bus_id),
-                    severity="critical" if vm < 0.90 else "warning",
+        for pos, sev in zip(bus_pos.tolist(), bus_sev.tolist()):
+            bus_id = int(bus_ids[pos])
+            v = float(vm[pos])
+            severity = violations_kernel.SEVERITY_NAMES[sev]
+            if v < violations_kernel.V_LOW:
+                violations.append(ViolationEvent.model_construct(
+                    violation_id=f"v_low_{bus_id}_{ts}",
+                    violation_type="voltage_low",
+                    zone=self._zone_lut[bus_id],
+                    severity=severity,
                     affected_components=[f"bus_{bus_id}"],
-                    current_value=vm,
+                    current_value=v,
                     limit_value=0.95,
                     unit="p.u.",
-                    message=f"Low voltage at bus {bus_id}: {vm:.4f} p.u.",
+                    message=f"Low voltage at bus {bus_id}: {v:.4f} p.u.",
                     timestamp=now,
                 ))
-            elif vm > 1.05:
-                violations.append(ViolationEvent(
-                    violation_id=f"v_high_{bus_id}_{now.timestamp():.0f}",
-                    violation_type="voltage",
-                    zone=self._bus_to_zone(bus_id),
-                    severity="critical" if vm > 1.10 else "warning",
+            else:
+                violations.append(ViolationEvent.model_construct(
+                    violation_id=f"v_high_{bus_id}_{ts}",
+                    violation_type="voltage_high",
+                    zone=self._zone_lut[bus_id],
+                    severity=severity,
                     affected_components=[f"bus_{bus_id}"],
-                    current_value=vm,
+                    current_value=v,
                     limit_value=1.05,
                     unit="p.u.",
-                    message=f"High voltage at bus {bus_id}: {vm:.4f} p.u.",
+                    message=f"High voltage at bus {bus_id}: {v:.4f} p.u.",
                     timestamp=now,
                 ))
 
         # Thermal violations
-        for line_id, loading in self.grid.get_line_loadings().items():
-            if loading > 100.0:
-                violations.append(ViolationEvent(
-                    violation_id=f"thermal_{line_id}_{now.timestamp():.0f}",
-                    violation_type="thermal",
-                    zone="system",
-                    severity="critical" if loading > 120 else "warning",
-                    affected_components=[f"line_{line_id}"],
-                    current_value=loading,
-                    limit_value=100.0,
-                    unit="%",
-                    message=f"Line {line_id} overloaded: {loading:.1f}%",
-                    timestamp=now,
-                ))
+        for pos, sev in zip(line_pos.tolist(), line_sev.tolist()):
+            line_id = int(line_ids[pos])
+            ld = float(loading[pos])
+            violations.append(ViolationEvent.model_construct(
+                violation_id=f"thermal_{line_id}_{ts}",
+                violation_type="thermal",
+                zone="system",
+                severity=violations_kernel.SEVERITY_NAMES[sev],
+                affected_components=[f"line_{line_id}"],
+                current_value=ld,
+                limit_value=100.0,
+                unit="%",
+                message=f"Line {line_id} overloaded: {ld:.1f}%",
+                timestamp=now,
+            ))
 
         # Frequency violations
         freq = self.grid.get_frequency()
-        if abs(freq - 60.0) > 0.5:
-            violations.append(ViolationEvent(
-                violation_id=f"freq_{now.timestamp():.0f}",
+        dev = freq - 60.0
+        if dev > 0.5 or dev < -0.5:
+            violations.append(ViolationEvent.model_construct(
+                violation_id=f"freq_{ts}",
                 violation_type="frequency",
                 zone="system",
-                severity="critical" if abs(freq - 60.0) > 1.0 else "warning",
+                severity="critical" if (dev > 1.0 or dev < -1.0) else "warning",
                 affected_components=["system"],
                 current_value=freq,
                 limit_value=60.0,
@@ -252,121 +336,142 @@ class MonitoringLoop:
         return violations
 
     def _group_by_zone(self, violations: list[ViolationEvent]) -> dict[str, list[ViolationEvent]]:
-        """Group violations by zone."""
-        groups: dict[str, list[ViolationEvent]] = defaultdict(list)
+        """Group violations by zone (zones without violations are omitted)."""
+        groups: dict[str, list[ViolationEvent]] = {k: [] for k in self._zone_keys}
         for v in violations:
             groups[v.zone].append(v)
-        return dict(groups)
+        return {k: g for k, g in groups.items() if g}
 
     def _build_directive(self, violations: list[ViolationEvent], zone_results: dict) -> str:
         """Build a concrete action directive for the strategic agent."""
         if not getattr(self.grid.net, "converged", True):
-            return (
-                "🚨 CRITICAL BLACKOUT: AC Power Flow Divergence. The grid topology is mathematically unstable. "
-                "Standard generator ramping will FAIL.\n\n"
-                "YOUR ONLY OPTIONS TO RESTORE THE GRID ARE:\n"
-                "1. Identify tripped lines (open circuit breakers) and CLOSE them.\n"
-                "2. If no lines are tripped, SHED at least 40% of all load immediately."
+            return _BLACKOUT_DIRECTIVE
+
+        # Classify (by canonical violation_type) and format in one pass
+        low_buses: list[str] = []
+        high_buses: list[str] = []
+        thermal_lines: list[str] = []
+        buckets = {"voltage_low": low_buses, "voltage_high": high_buses, "thermal": thermal_lines}
+        v_lines: list[str] = []
+        for v in violations:
+            vt = v.violation_type
+            comp = v.affected_components[0] if v.affected_components else "?"
+            bucket = buckets.get(vt)
+            if bucket is not None:
+                bucket.append(comp)
+            v_lines.append(
+                f"  [{v.severity.upper()}] zone={v.zone} component={comp} "
+                f"type={vt} val={v.current_value:.4f} limit={v.limit_value:.2f}"
             )
 
-        # Count violation types using correct ViolationEvent field names
-        low_v  = [v for v in violations if "low"     in v.violation_type]
-        high_v = [v for v in violations if "high"    in v.violation_type]
-        thermal = [v for v in violations if "thermal" in v.violation_type]
+        inventory = self._device_inventory()
+        gen_ids = inventory["gen_ids"]
+        load_ids = inventory["load_ids"]
+        shunt_ids = inventory["shunt_ids"]
 
-        def _bus(v: ViolationEvent) -> str:
-            return v.affected_components[0] if v.affected_components else "?"
+        # Snapshot the columns read below instead of per-element .iloc/.at lookups
+        gen = self.grid.net.gen
+        gen_p = gen.p_mw.to_numpy(dtype=float)
+        gen_max = gen.max_p_mw.to_numpy(dtype=float) if self._has_max_p else gen_p * 1.5
+        shunt_on = self.grid.net.shunt.in_service.to_numpy(dtype=bool).tolist()
 
-        actions = []
-        gen_ids  = [f"gen_{g}"  for g in self.grid.net.gen.index]
-        load_ids = [f"load_{l}" for l in self.grid.net.load.index]
+        # Real device ID inventory so LLM can't hallucinate IDs; only the
+        # live status values are rendered per call
+        gen_status = ", ".join(
+            f"{gid}={p:.1f}MW" for gid, p in zip(gen_ids, gen_p.tolist())
+        )
+        shunt_status = ", ".join(
+            f"{sid}={'ON' if on else 'OFF'}" for sid, on in zip(shunt_ids, shunt_on)
+        )
 
-        if low_v:
-            current_p = float(self.grid.net.gen.p_mw.iloc[0])
-            max_p = float(self.grid.net.gen.max_p_mw.iloc[0]) if "max_p_mw" in self.grid.net.gen.columns else current_p * 1.5
+        # The directive is assembled line by line and joined once at the end
+        parts = [
+            f"GRID EMERGENCY — {len(violations)} violations across {len(zone_results)} zones.",
+            f"Low voltage: {low_buses} | High voltage: {high_buses} | Thermal: {thermal_lines}",
+            "",
+            "AVAILABLE DEVICES (use ONLY these exact IDs):",
+            f"  Generators: {inventory['gen_ids_str']}  (current: {gen_status})",
+            f"  Loads (ALL of them): {inventory['load_ids_str']}",
+            f"  Capacitor banks (voltage_regulator): {inventory['shunt_ids_str']}  ({shunt_status})",
+            "  ⚠ Do NOT use IDs like reg_X, cap_X, load_25+ — they do not exist!",
+            "",
+            "Violations:",
+            *v_lines,
+            "",
+            "PRE-COMPUTED CORRECTIVE ACTIONS (call these tools NOW):",
+        ]
+        n_header = len(parts)
+
+        if low_buses:
+            current_p = float(gen_p[0])
+            max_p = float(gen_max[0])
             target_p  = min(current_p + 10.0, max_p)
             primary_gen = gen_ids[0] if gen_ids else "gen_0"
-            actions.append(
+            parts.append(
                 f"  • Call generator_actuator_system_control(device_id='{primary_gen}', action='set_output', "
                 f"parameters={{'p_mw': {target_p:.1f}}}) "
                 f"→ Raises voltage by injecting {target_p - current_p:.1f} MW more."
             )
             if len(gen_ids) > 1:
-                current_p2 = float(self.grid.net.gen.p_mw.iloc[1])
-                max_p2 = float(self.grid.net.gen.max_p_mw.iloc[1]) if "max_p_mw" in self.grid.net.gen.columns else current_p2 * 1.5
+                current_p2 = float(gen_p[1])
+                max_p2 = float(gen_max[1])
                 target_p2 = min(current_p2 + 5.0, max_p2)
-                actions.append(
+                parts.append(
                     f"  • Also consider generator_actuator_system_control(device_id='{gen_ids[1]}', action='set_output', "
                     f"parameters={{'p_mw': {target_p2:.1f}}}) "
                     f"→ Additional support from secondary generator."
                 )
             # Reactive power support via capacitor banks (most effective for voltage)
-            shunt_ids = [f"shunt_{s}" for s in self.grid.net.shunt.index]
-            for sid in shunt_ids:
-                s_idx = int(sid.replace("shunt_", ""))
-                if not self.grid.net.shunt.in_service.at[s_idx]:
-                    actions.append(
+            for sid, on in zip(shunt_ids, shunt_on):
+                if not on:
+                    parts.append(
                         f"  • Call voltage_regulator_actuator_system_control(device_id='{sid}', action='activate') "
                         f"→ Activate capacitor bank to inject reactive power and raise voltage."
                     )
 
-        if thermal:
+        if thermal_lines:
             critical_loads = load_ids[:2] if len(load_ids) >= 2 else load_ids
             for lid in critical_loads:
-                actions.append(
+                parts.append(
                     f"  • Call load_controller_actuator_system_control(device_id='{lid}', action='scale', "
                     f"parameters={{'scale_factor': 0.8}}) "
                     f"→ Reduce load by 20% to relieve line overload."
                 )
 
-        if not actions:
+        if len(parts) == n_header:
             primary_gen = gen_ids[0] if gen_ids else "gen_0"
-            actions.append(
+            parts.append(
                 f"  • Call generator_actuator_system_control(device_id='{primary_gen}', action='ramp', "
                 f"parameters={{'delta_mw': 5.0}}) → Generic voltage support."
             )
 
-        low_buses  = [_bus(v) for v in low_v]
-        high_buses = [_bus(v) for v in high_v]
-        thermal_lines = [_bus(v) for v in thermal]
-        v_table = self._format_violations(violations)
-        action_block = "\n".join(actions)
+        parts += ("", "Execute the first action immediately.")
+        return "\n".join(parts)
+
+    def _device_inventory(self) -> dict:
+        """Device ID lists and joined strings, cached while element counts are unchanged."""
+        net = self.grid.net
+        key = (len(net.gen), len(net.load), len(net.shunt))
+        if self._inventory_cache is None or key != self._inventory_topology_key:
+            gen_ids = [f"gen_{g}" for g in net.gen.index]
+            load_ids = [f"load_{l}" for l in net.load.index]
+            shunt_ids = [f"shunt_{s}" for s in net.shunt.index]
+            self._inventory_cache = {
+                "gen_ids": gen_ids,
+                "load_ids": load_ids,
+                "shunt_ids": shunt_ids,
+                "gen_ids_str": ", ".join(gen_ids),
+                "load_ids_str": ", ".join(load_ids),
+                "shunt_ids_str": ", ".join(shunt_ids),
+            }
+            self._inventory_topology_key = key
+        return self._inventory_cache
 
-        # Build real device ID inventory so LLM can't hallucinate IDs
-        real_gen_ids  = [f"gen_{g}"  for g in self.grid.net.gen.index]
-        real_load_ids = [f"load_{l}" for l in self.grid.net.load.index]
-        real_shunt_ids = [f"shunt_{s}" for s in self.grid.net.shunt.index]
-        gen_status = ", ".join(
-            f"{gid}={float(self.grid.net.gen.p_mw.at[g]):.1f}MW"
-            for gid, g in zip(real_gen_ids, self.grid.net.gen.index)
-        )
-        shunt_status = ", ".join(
-            f"{sid}={'ON' if self.grid.net.shunt.in_service.at[s] else 'OFF'}"
-            for sid, s in zip(real_shunt_ids, self.grid.net.shunt.index)
-        )
-
-        return (
-            f"GRID EMERGENCY — {len(violations)} violations across {len(zone_results)} zones.\n"
-            f"Low voltage: {low_buses} | High voltage: {high_buses} | Thermal: {thermal_lines}\n\n"
-            f"AVAILABLE DEVICES (use ONLY these exact IDs):\n"
-            f"  Generators: {', '.join(real_gen_ids)}  (current: {gen_status})\n"
-            f"  Loads (ALL of them): {', '.join(real_load_ids)}\n"
-            f"  Capacitor banks (voltage_regulator): {', '.join(real_shunt_ids)}  ({shunt_status})\n"
-            f"  ⚠ Do NOT use IDs like reg_X, cap_X, load_25+ — they do not exist!\n\n"
-            f"Violations:\n{v_table}\n\n"
-            f"PRE-COMPUTED CORRECTIVE ACTIONS (call these tools NOW):\n{action_block}\n\n"
-            f"Execute the first action immediately."
-        )
-
-    def _format_violations(self, violations: list[ViolationEvent]) -> str:
-        lines = []
-        for v in violations:
-            comp = v.affected_components[0] if v.affected_components else "?"
-            lines.append(
-                f"  [{v.severity.upper()}] zone={v.zone} component={comp} "
-                f"type={v.violation_type} val={v.current_value:.4f} limit={v.limit_value:.2f}"
-            )
-        return "\n".join(lines)
+    @staticmethod
+    def _zone_health_label(n_violations: int) -> str:
+        if n_violations > 2:
+            return "critical"
+        return "warning" if n_violations else "healthy"
 
     @staticmethod
     def _bus_to_zone(bus_id: int) -> str:
@@ -378,4 +483,4 @@ class MonitoringLoop:
             return "zone3"
 
     def get_violation_history(self) -> list[dict]:
-        return [v.model_dump(mode="json") for v in self._violations_history[-50:]]
+        return list(self._violations_history_json)
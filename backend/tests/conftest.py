@@ -2,17 +2,41 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
+
 import pytest
 
+from src.coordination import audit
+from src.registry import store
 from src.simulation.power_grid import PowerGridSimulation
 
 
-@pytest.fixture
-def grid() -> PowerGridSimulation:
-    """Fresh IEEE 30-bus power grid simulation."""
+@pytest.fixture(autouse=True)
+def _isolated_state_files(tmp_path, monkeypatch) -> None:
+    """Keep the registry JSON and the zone audit DB out of the source tree."""
+    monkeypatch.setattr(store, "PERSIST_FILE", tmp_path / "registry_store.json")
+    monkeypatch.setattr(audit, "DB_PATH", str(tmp_path / "zone_audit.db"))
+    # The audit logger is a singleton that creates its schema once: start fresh
+    monkeypatch.setattr(audit.ZoneAuditLogger, "_instance", None)
+
+
+@pytest.fixture(scope="session")
+def _base_grid() -> PowerGridSimulation:
+    """IEEE 30-bus grid, built once per session (use ``grid`` in tests)."""
     return PowerGridSimulation()
 
 
+@pytest.fixture
+def grid(_base_grid: PowerGridSimulation) -> Iterator[PowerGridSimulation]:
+    """IEEE 30-bus power grid, rolled back to its initial state after each test."""
+    n_snapshots = len(_base_grid._snapshots)
+    idx = _base_grid.save_snapshot()
+    yield _base_grid
+    _base_grid.restore_snapshot(idx)
+    # Forget snapshots taken during the test so indices don't leak between tests
+    del _base_grid._snapshots[n_snapshots:]
+
+
 @pytest.fixture
 def grid_with_snapshot(grid: PowerGridSimulation) -> tuple[PowerGridSimulation, int]:
     """Grid with a saved snapshot for rollback tests."""
@@ -0,0 +1,125 @@
+"""Tests for the strategic agent's tool catalog and tool loop."""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.common.llm_client import LLMClient
+from src.strategic import agent as agent_module
+from src.strategic.agent import StrategicAgent, _compress_description
+from src.strategic.memory import ContextMemory
+
+_REGISTRY_TOOLS = [
+    {
+        "server_id": "actuator_breaker_001",
+        "server_name": "Breaker Actuator",
+        "name": "actuate_device",
+        "description": "Open or close a circuit breaker",
+        "layer": "physical",
+        "zone": "zone1",
+    },
+    {
+        "server_id": "sensor_voltage_001",
+        "server_name": "Voltage Sensor",
+        "name": "read_sensor",
+        "description": "Read bus voltage",
+        "layer": "physical",
+        "zone": "zone1",
+    },
+]
+
+
+class TestToolDiscovery:
+    def test_compress_description_keeps_names(self):
+        """Filler and articles go; a capital "A" naming a phase or zone stays."""
+        text = "Use this to open a breaker on phase A in the feeder of zone A"
+        assert _compress_description(text) == "open breaker on phase A in feeder of zone A"
+
+    @pytest.fixture
+    def cache_file(self, tmp_path, monkeypatch):
+        path = tmp_path / "tools.json"
+        monkeypatch.setattr(agent_module, "TOOL_CACHE_FILE", path)
+        return path
+
+    def _make_agent(self, tmp_path, handler) -> StrategicAgent:
+        agent = StrategicAgent(memory=ContextMemory(tmp_path / "memory.db"))
+        agent._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return agent
+
+    async def test_not_modified_rebuilds_catalog_from_cache(self, tmp_path, cache_file):
+        def full(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json=_REGISTRY_TOOLS, headers={"ETag": '"v1"'})
+
+        first = self._make_agent(tmp_path, full)
+        assert await first.discover_tools() == 2
+        await first.aclose()
+        assert cache_file.exists()
+
+        seen_headers = []
+
+        def not_modified(request: httpx.Request) -> httpx.Response:
+            seen_headers.append(request.headers.get("if-none-match"))
+            return httpx.Response(304)
+
+        second = self._make_agent(tmp_path, not_modified)
+        assert await second.discover_tools() == 2
+        await second.aclose()
+
+        assert seen_headers == ['"v1"']
+        assert second._tools == first._tools
+        assert second._tool_info == first._tool_info
+        assert second._tool_info["breaker_actuator_actuate_device"].server_id == "actuator_breaker_001"
+        assert second.actuator_tools == first.actuator_tools
+        assert [t["function"]["name"] for t in second.actuator_tools] == [
+            "breaker_actuator_actuate_device"
+        ]
+
+
+class TestToolLoop:
+    @staticmethod
+    def _llm_with_turn(tool_names: list[str]) -> LLMClient:
+        """LLM client whose backend asks for ``tool_names`` once, then answers."""
+        calls = [
+            SimpleNamespace(id=f"call_{i}", function=SimpleNamespace(name=name, arguments="{}"))
+            for i, name in enumerate(tool_names)
+        ]
+        replies = iter([
+            SimpleNamespace(tool_calls=calls, content=None),
+            SimpleNamespace(tool_calls=None, content="done"),
+        ])
+
+        async def create(**kwargs):
+            return SimpleNamespace(choices=[SimpleNamespace(message=next(replies))])
+
+        llm = LLMClient(model="test")
+        llm.client = SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+        )
+        return llm
+
+    async def test_mutating_calls_run_in_requested_order(self):
+        llm = self._llm_with_turn(["control_1", "read_a", "read_b", "control_2"])
+        delays = {"control_1": 0.03, "read_a": 0.02, "read_b": 0.01, "control_2": 0.0}
+        events = []
+
+        async def executor(name: str, args: dict) -> dict:
+            events.append(("start", name))
+            await asyncio.sleep(delays[name])
+            events.append(("end", name))
+            return {"message": name}
+
+        result = await llm.tool_loop(
+            "go", [{"type": "function"}], executor,
+            is_read_only=lambda name: name.startswith("read"),
+        )
+
+        assert result == "done"
+        assert events == [
+            ("start", "control_1"), ("end", "control_1"),
+            # Reads between the control calls overlap
+            ("start", "read_a"), ("start", "read_b"),
+            ("end", "read_b"), ("end", "read_a"),
+            ("start", "control_2"), ("end", "control_2"),
+        ]
@@ -59,6 +59,13 @@ class TestRegistry:
         tools = resp.json()
         assert any(t["name"] == "read_sensor" for t in tools)
 
+    def test_list_tools_etag(self, client, sample_registration):
+        client.post("/register", json=sample_registration)
+        etag = client.get("/tools").headers["etag"]
+        resp = client.get("/tools", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.headers["etag"] == etag
+
     def test_unregister(self, client, sample_registration):
         client.post("/register", json=sample_registration)
         resp = client.delete("/unregister/test_sensor_001")
@@ -1,5 +1,9 @@
 """Tests for the power grid simulation."""
 
+import numpy as np
+import pytest
+
+from src.simulation import violations_kernel as kernel
 from src.simulation.power_grid import PowerGridSimulation
 
 
@@ -105,3 +109,152 @@ class TestPowerGridSimulation:
         for trafo_id in grid.net.trafo.index:
             temp = grid.get_transformer_temperature(trafo_id)
             assert 20.0 <= temp <= 200.0
+
+    def test_transformer_temperatures_bulk(self, grid: PowerGridSimulation):
+        """Bulk temperatures match the per-transformer value and the exact model."""
+        temps = grid.get_transformer_temperatures()
+        assert set(temps) == set(grid.net.trafo.index)
+        for trafo_id, temp in temps.items():
+            assert temp == grid.get_transformer_temperature(trafo_id)
+            loading = float(grid.net.res_trafo.loading_percent.at[trafo_id])
+            assert temp == round(25.0 + 65.0 * (loading / 100.0) ** 1.6, 1)
+
+    def test_get_state_nodes_and_edges(self, grid: PowerGridSimulation):
+        """UI state should include one node per bus and one edge per line."""
+        state = grid.get_state()
+        assert len(state["nodes"]) == 30
+        assert len(state["edges"]) == len(grid.net.line)
+        zones = {n["id"]: n["zone"] for n in state["nodes"]}
+        assert zones[0] == "zone1" and zones[15] == "zone2" and zones[29] == "zone3"
+        edge = state["edges"][0]
+        assert edge["from_bus"] == int(grid.net.line.from_bus.at[edge["id"]])
+
+    def test_violations_memoized_per_power_flow(self, grid: PowerGridSimulation):
+        """Violation checks are reused until the next power flow."""
+        first = grid._check_violations()
+        assert grid._check_violations() is first
+        grid.run_power_flow()
+        assert grid._check_violations() is not first
+
+    def test_validate_action_linear_screen(self, grid: PowerGridSimulation):
+        """Small injection changes are cleared by the DC screen without touching state."""
+        current_p = float(grid.net.gen.p_mw.at[0])
+        voltages = grid.get_bus_voltages()
+        result = grid.validate_action(grid.set_generator_output, 0, current_p + 1.0)
+        assert result["safe"] is True
+        assert "DC sensitivity" in result["note"]
+        assert float(grid.net.gen.p_mw.at[0]) == current_p
+        assert grid.get_bus_voltages() == voltages
+
+        # Topology changes are outside the linear screen
+        result = grid.validate_action(grid.set_line_status, 0, False, mode="ac")
+        assert "Only new/worsened" in result["note"]
+        assert bool(grid.net.line.in_service.at[0]) is True
+
+    def test_linear_screen_checks_voltage(self, grid: PowerGridSimulation):
+        """Small injections that would undervolt a bus are left to AC validation."""
+        result = grid.validate_action(grid.inject_load_change, 25, 9.0)
+        assert result["safe"] is False
+        assert "bus_25" in {v["component"] for v in result["violations"]}
+
+    def test_validate_action_ac_mode_skips_screens(self, grid: PowerGridSimulation):
+        """mode="ac" always gets the exact AC check, even for screenable actions."""
+        gen_id = int(grid.net.gen.index[0])
+        p_mw = float(grid.net.gen.p_mw.at[gen_id]) + 1.0
+        screened = grid.validate_action(grid.set_generator_output, gen_id, p_mw)
+        assert "Screened" in screened["note"]
+
+        result = grid.validate_action(grid.set_generator_output, gen_id, p_mw, mode="ac")
+        assert result["safe"] is True
+        assert "Screened" not in result["note"]
+
+    def test_validate_action_enforces_q_limits(self, grid: PowerGridSimulation):
+        """The AC sandbox solves with generator Q-limits, like committed actions."""
+        result = grid.validate_action(grid.scale_load, 3, 2.0, mode="ac")
+        assert result["safe"] is False
+        assert any(v["type"] == "voltage" for v in result["violations"])
+
+    def test_validate_action_dc_first_preserves_ac_state(self, grid: PowerGridSimulation):
+        """The DC pre-check must not leave DC results behind in the net."""
+        voltages = grid.get_bus_voltages()
+        result = grid.validate_action(grid.set_line_status, 5, False)
+        assert "safe" in result
+        assert bool(grid.net.line.in_service.at[5]) is True
+        for bus_id, vm in grid.get_bus_voltages().items():
+            assert abs(vm - voltages[bus_id]) < 0.001
+
+    def test_dc_screen_leaves_switching_to_ac(self, grid: PowerGridSimulation):
+        """Line switching and reactive load changes always get a full AC check."""
+        result = grid.validate_action(grid.set_line_status, 0, False)
+        assert result["safe"] is False
+        assert "DC" not in result["note"]
+        result = grid.validate_action(grid.scale_load, 3, 1.5)
+        assert result["safe"] is False
+        assert "DC" not in result["note"]
+
+    def test_dc_power_flow_invalidates_violations(self, grid: PowerGridSimulation):
+        """A public DC solve replaces the results, so memoized AC violations are dropped."""
+        first = grid._check_violations()
+        grid.run_dc_power_flow()
+        assert grid._check_violations() is not first
+
+    def test_evaluate_actions_batch(self, grid: PowerGridSimulation):
+        """Batch evaluation returns one aligned result per candidate and restores state."""
+        initial_voltages = grid.get_bus_voltages()
+        current_p = float(grid.net.gen.p_mw.at[0])
+        results = grid.evaluate_actions([
+            lambda: grid.set_generator_output(0, current_p + 5.0),
+            lambda: grid.scale_load(0, 0.9),
+            lambda: grid.set_line_status(0, False),
+        ])
+        assert len(results) == 3
+        assert all("safe" in r and "violations" in r for r in results)
+        assert float(grid.net.gen.p_mw.at[0]) == current_p
+        assert bool(grid.net.line.in_service.at[0]) is True
+        for bus_id, vm in grid.get_bus_voltages().items():
+            assert abs(vm - initial_voltages[bus_id]) < 0.001
+
+    def test_voltage_and_loading_arrays(self, grid: PowerGridSimulation):
+        """Array getters align with the dict getters."""
+        assert grid.get_bus_voltages_array().tolist() == list(grid.get_bus_voltages().values())
+        assert grid.get_line_loadings_array().tolist() == list(grid.get_line_loadings().values())
+
+    def test_solution_is_current_tracks_inputs(self, grid: PowerGridSimulation):
+        """Editing an input table directly marks the last solution as stale."""
+        assert grid.solution_is_current()
+        grid.net.load.loc[grid.net.load.index[0], "p_mw"] += 1.0
+        assert not grid.solution_is_current()
+        grid.run_power_flow()
+        assert grid.solution_is_current()
+
+    def test_failed_solve_is_not_current(self, grid: PowerGridSimulation):
+        """A diverged power flow is retried rather than memoized."""
+        grid.net.load["p_mw"] *= 20.0
+        assert grid.run_power_flow() is False
+        assert not grid.solution_is_current()
+
+    def test_noop_mutations_skip_power_flow(self, grid: PowerGridSimulation):
+        """Re-applying the current setting does not trigger a new power flow."""
+        generation = grid._pf_generation
+        grid.set_line_status(0, True)
+        shunt_id = int(grid.net.shunt.index[0])
+        grid.set_shunt_status(shunt_id, bool(grid.net.shunt.in_service.at[shunt_id]))
+        grid.set_generator_output(0, float(grid.net.gen.p_mw.at[0]))
+        grid.scale_load(0, 1.0)
+        assert grid._pf_generation == generation
+        grid.set_line_status(0, False)
+        assert grid._pf_generation == generation + 1
+
+    @pytest.mark.parametrize("scan", [kernel._scan_loop, kernel._scan_numpy])
+    def test_violations_kernel_scan(self, scan):
+        """Both scan implementations report only violating positions with severity codes."""
+        vm = np.array([1.0, 0.94, 0.85, 1.06, 1.2])
+        loading = np.array([50.0, 101.0, 130.0])
+        bus, bus_sev, line, line_sev = scan(vm, loading)
+        assert bus.tolist() == [1, 2, 3, 4]
+        assert bus_sev.tolist() == [
+            kernel.SEVERITY_WARNING, kernel.SEVERITY_CRITICAL,
+            kernel.SEVERITY_WARNING, kernel.SEVERITY_CRITICAL,
+        ]
+        assert line.tolist() == [1, 2]
+        assert line_sev.tolist() == [kernel.SEVERITY_WARNING, kernel.SEVERITY_CRITICAL]